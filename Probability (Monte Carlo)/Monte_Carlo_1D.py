@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.integrate import simps
+from mc_integrate import mc_integrate
 
 #we solving f(x)=x^2
 
@@ -32,8 +33,12 @@ samples = np.random.uniform(low=0, high=width, size=10000)
 monte_carlo = f(samples).mean()* width
 print('Monte Carlo=',monte_carlo)
 
-#error using standard deviation
-error = np.std(samples * width) / np.sqrt(samples.size)
+#error using standard deviation of f (not of the sample positions)
+error = width * np.std(f(samples), ddof=1) / np.sqrt(samples.size)
+
+#adaptive Monte Carlo: draw in chunks until the standard error hits the target
+adaptive = mc_integrate(f, [(a, b)], target_se=1e-3, seed=0)
+print(f'Adaptive Monte Carlo= {adaptive.value} ± {adaptive.error} (N={adaptive.n})')
 
 plt.plot(x, f(x), label="f(x)=sin(x)")
 plt.fill_between(x, 0, f(x), alpha=0.1)
@@ -2,6 +2,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 from scipy.integrate import dblquad
+from mc_integrate import mc_integrate, qmc_integrate
 
 # 1. Define the function f(x, y) = x+y
 def f(x, y):
@@ -32,13 +33,21 @@ z_values = f(x_samples, y_samples)
 domain_area = (x_max - x_min) * (y_max - y_min)
 monte_carlo_result = z_values.mean() * domain_area
 
-# Calculate Error (Standard Deviation)
-monte_carlo_error = np.std(z_values * domain_area) / np.sqrt(N)
+# Calculate Error (Standard Deviation of f, scaled by the area)
+monte_carlo_error = domain_area * np.std(z_values, ddof=1) / np.sqrt(N)
+
+# Adaptive Monte Carlo: draw in chunks until the standard error hits the target
+adaptive = mc_integrate(f, [(x_min, x_max), (y_min, y_max)], target_se=1e-3, seed=0)
+
+# Quasi-Monte Carlo: scrambled Sobol points, error bar from 16 independent scramblings
+quasi = qmc_integrate(f, [(x_min, x_max), (y_min, y_max)], n=1024, method="sobol", seed=0)
 
 # Print results to console
 print(f"--- Results ---")
 print(f"Exact Result (dblquad):   {exact_result:.5f}")
 print(f"Monte Carlo Result:       {monte_carlo_result:.5f} ± {monte_carlo_error:.5f}")
+print(f"Adaptive Monte Carlo:     {adaptive.value:.5f} ± {adaptive.error:.5f} (N={adaptive.n})")
+print(f"Quasi-MC (Sobol):         {quasi.value:.5f} ± {quasi.error:.5f} (N={quasi.n})")
 
 
 # --- PART B: 3D VISUALIZATION ---
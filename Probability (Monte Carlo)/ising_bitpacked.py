@@ -0,0 +1,174 @@
+"""
+Multi-spin coded (bit-packed) 2D Ising model for very large lattices.
+
+Each spin is one bit (1 -> +1, 0 -> -1), 64 spins per uint64 word. This is
+64x less memory than the int64 array in ising_model.py, so an L=16384
+lattice takes 32 MB instead of 2 GB.
+
+Checkerboard Metropolis works on whole words with bitwise logic:
+  - x_k = spin XOR neighbour_k marks the anti-aligned neighbours (k = 1..4)
+  - a bit-sliced adder classifies every site as d = 0, d = 1 or d >= 2
+    anti-aligned neighbours, where dE = 2J S nb = 8J - 4J d
+  - d >= 2 always flips; d = 1 and d = 0 flip with exp(-4J/kT) and
+    exp(-8J/kT), tested by a bit-sliced comparison of `bits` random words
+    against the fixed-point threshold (resolution 2^-bits)
+Rows are processed in chunks to bound the memory used for random words.
+
+L must be a multiple of 64.
+
+Usage:
+  python ising_bitpacked.py --L 1024 --T 2.0 --sweeps 200
+  python ising_bitpacked.py --L 16384 --T 2.0 --sweeps 20
+"""
+
+import argparse
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+J = 1.0
+kB = 1.0
+
+ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+EVEN_BITS = np.uint64(0x5555555555555555)   # columns 0, 2, 4, ... of a word
+ODD_BITS = np.uint64(0xAAAAAAAAAAAAAAAA)
+
+
+def pack(spins):
+    """(L, L) array of +-1 -> (L, L/64) uint64 words, bit b of word w = column 64w+b."""
+    L = spins.shape[0]
+    if L % 64:
+        raise ValueError("L must be a multiple of 64.")
+    bits = np.packbits(spins > 0, axis=1, bitorder="little")
+    return bits.view("<u8").astype(np.uint64).reshape(L, L // 64)
+
+
+def unpack(words):
+    """(rows, L/64) uint64 words -> (rows, L) int8 array of +-1 (for plotting)."""
+    bits = np.unpackbits(words.astype("<u8").view(np.uint8), axis=1, bitorder="little")
+    return 2 * bits.astype(np.int8) - 1
+
+
+def random_lattice(L, rng):
+    """Random +-1 lattice, generated directly in packed form."""
+    return rng.integers(0, ONES, size=(L, L // 64), dtype=np.uint64, endpoint=True)
+
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(words):
+        return int(np.bitwise_count(words).sum())
+else:
+    def _popcount(words):
+        return int(np.unpackbits(words.view(np.uint8)).sum())
+
+
+def _left(words):
+    """Word array of the left neighbour (column - 1) of every site, periodic."""
+    prev = np.roll(words, 1, axis=1)
+    return (words << np.uint64(1)) | (prev >> np.uint64(63))
+
+
+def _right(words):
+    """Word array of the right neighbour (column + 1) of every site, periodic."""
+    nxt = np.roll(words, -1, axis=1)
+    return (words >> np.uint64(1)) | (nxt << np.uint64(63))
+
+
+def magnetization(words):
+    """Total magnetization M = (#up) - (#down)."""
+    n = words.size * 64
+    return 2 * _popcount(words) - n
+
+
+def energy(words):
+    """Total energy from the number of anti-aligned right and down bonds."""
+    n = words.size * 64
+    disagree = _popcount(words ^ _right(words)) + _popcount(words ^ np.roll(words, -1, axis=0))
+    return -J * (2 * n - 2 * disagree)
+
+
+def _threshold_bits(p, bits):
+    """Fixed-point threshold of probability p as a list of all-ones/all-zeros words, MSB first."""
+    t = min(int(round(p * 2**bits)), 2**bits)
+    if t == 2**bits:
+        return None   # always accept
+    return [ONES if (t >> (bits - 1 - i)) & 1 else np.uint64(0) for i in range(bits)]
+
+
+def _less_than(rand, thr):
+    """Bitwise test (random fixed-point number < threshold) for every bit lane."""
+    if thr is None:
+        return ONES
+    lt = np.zeros(rand.shape[1:], dtype=np.uint64)
+    eq = np.full(rand.shape[1:], ONES, dtype=np.uint64)
+    for r, t in zip(rand, thr):
+        lt |= eq & t & ~r
+        eq &= ~(r ^ t)
+    return lt
+
+
+def sweep(words, T, rng, bits=24, chunk_rows=256):
+    """One checkerboard Metropolis sweep of the packed lattice (in place)."""
+    L, W = words.shape
+    thr4 = _threshold_bits(np.exp(-4.0 * J / (kB * T)), bits)
+    thr8 = _threshold_bits(np.exp(-8.0 * J / (kB * T)), bits)
+    row_parity = (np.arange(L) % 2)[:, None]
+
+    for colour in (0, 1):
+        for r0 in range(0, L, chunk_rows):
+            rows = np.arange(r0, min(r0 + chunk_rows, L))
+            s = words[rows]
+            x1 = s ^ words[(rows - 1) % L]
+            x2 = s ^ words[(rows + 1) % L]
+            x3 = s ^ _left(s)
+            x4 = s ^ _right(s)
+
+            # bit-sliced count of anti-aligned neighbours
+            s1, c1 = x1 ^ x2, x1 & x2
+            s2, c2 = x3 ^ x4, x3 & x4
+            d_ge2 = c1 | c2 | (s1 & s2)
+            d_eq1 = (s1 ^ s2) & ~c1 & ~c2
+            d_eq0 = ~(x1 | x2 | x3 | x4)
+
+            rand = rng.integers(0, ONES, size=(bits,) + s.shape, dtype=np.uint64, endpoint=True)
+            flip = d_ge2 | (d_eq1 & _less_than(rand, thr4)) | (d_eq0 & _less_than(rand, thr8))
+
+            # sites of this colour: (row + column) % 2 == colour
+            colour_mask = np.where((row_parity[rows] + colour) % 2 == 0, EVEN_BITS, ODD_BITS)
+            words[rows] = s ^ (flip & colour_mask)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--L", type=int, default=1024, help="lattice size (multiple of 64)")
+    ap.add_argument("--T", type=float, default=2.0)
+    ap.add_argument("--sweeps", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    words = random_lattice(args.L, rng)
+    n = args.L**2
+    print(f"L={args.L}: packed lattice {words.nbytes / 2**20:.1f} MB "
+          f"(int64 array would be {8 * n / 2**20:.1f} MB)")
+
+    t0 = time.time()
+    for k in range(args.sweeps):
+        sweep(words, args.T, rng)
+    elapsed = time.time() - t0
+    print(f"{args.sweeps} sweeps in {elapsed:.2f}s "
+          f"({elapsed / args.sweeps * 1e9 / n:.2f} ns per spin update)")
+    print(f"e = {energy(words) / n:.5f}, m = {magnetization(words) / n:.5f}")
+
+    # plot at most 1024 x 1024 spins
+    step = max(1, args.L // 1024)
+    plt.figure(figsize=(6, 6))
+    plt.imshow(unpack(words[::step])[:, ::step], cmap="gray", interpolation="nearest")
+    plt.title(f"Bit-packed Ising, L = {args.L}, T = {args.T}")
+    plt.axis("off")
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
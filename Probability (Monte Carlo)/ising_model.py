@@ -1,3 +1,5 @@
+import time
+
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -8,25 +10,21 @@ n_steps = 10000      # Number of Metropolis updates
 J = 1.0               # Interaction strength
 kB = 1.0              # Boltzmann constant
 
-# Initialize the spin lattice randomly
-spins = np.random.choice([-1, 1], size=(L, L))
-
-# Save initial configuration
-initial_spins = spins.copy()
-
-# Function to compute energy of the system
+# Function to compute energy of the system (full O(L^2) recount).
+# The simulation tracks E incrementally; this is used to start and to validate.
 def compute_energy(spins):
-    energy = 0
-    for i in range(L):
-        for j in range(L):
-            S = spins[i, j]
-            neighbors = spins[(i+1)%L, j] + spins[i, (j+1)%L] + \
-                        spins[(i-1)%L, j] + spins[i, (j-1)%L]
-            energy += -J * S * neighbors
-    return energy / 2.0  # Each pair counted twice
+    # each bond counted once: right and down neighbours only
+    return -J * np.sum(spins * (np.roll(spins, -1, axis=0) + np.roll(spins, -1, axis=1)))
+
+# Total magnetization M = sum of spins
+def compute_magnetization(spins):
+    return int(np.sum(spins))
 
 # Perform one Metropolis step (L*L spin updates)
+# Returns the change (dE, dM) from all accepted flips
 def metropolis_step(spins, T):
+    L = spins.shape[0]
+    dE_total, dM_total = 0.0, 0
     for _ in range(L * L):
         i, j = np.random.randint(0, L, size=2)
         S = spins[i, j]
@@ -35,41 +33,255 @@ def metropolis_step(spins, T):
         dE = 2 * J * S * neighbors
         if dE <= 0 or np.random.rand() < np.exp(-dE / (kB * T)):
             spins[i, j] *= -1
+            dE_total += dE
+            dM_total -= 2 * S
+    return dE_total, dM_total
+
+# Acceptance probabilities min(1, exp(-dE/kT)) for the 5 possible
+# values of S * (sum of neighbours) = -4, -2, 0, 2, 4  (dE = 2 J S nb)
+def boltzmann_table(T):
+    k = np.arange(-4, 5, 2)
+    return np.minimum(1.0, np.exp(-2.0 * J * k / (kB * T)))
+
+# Sublattice masks: black (i+j even) and white (i+j odd) sites
+def checkerboard_masks(L):
+    if L % 2:
+        raise ValueError("Checkerboard update needs an even L with periodic boundaries.")
+    i, j = np.indices((L, L))
+    black = (i + j) % 2 == 0
+    return black, ~black
+
+# One checkerboard sweep: every site of one colour only has neighbours of
+# the other colour, so a whole half-lattice is updated in one expression.
+# Flips within a half-lattice do not interact, so (dE, dM) are exact sums.
+def checkerboard_step(spins, T, rng, table=None, masks=None):
+    if table is None:
+        table = boltzmann_table(T)
+    if masks is None:
+        masks = checkerboard_masks(spins.shape[0])
+    dE_total, dM_total = 0.0, 0
+    for mask in masks:
+        neighbors = np.roll(spins, 1, axis=0) + np.roll(spins, -1, axis=0) + \
+                    np.roll(spins, 1, axis=1) + np.roll(spins, -1, axis=1)
+        local = spins * neighbors
+        p_accept = table[(local + 4) // 2]
+        flip = mask & (rng.random(spins.shape) < p_accept)
+        dE_total += 2 * J * np.sum(local[flip])
+        dM_total -= 2 * int(np.sum(spins[flip]))
+        spins[flip] *= -1
+    return dE_total, dM_total
+
+# Flat-index neighbour table (N, 4): up, down, left, right with periodic wrap
+def neighbor_table(L):
+    idx = np.arange(L * L).reshape(L, L)
+    return np.stack([np.roll(idx, 1, axis=0).ravel(), np.roll(idx, -1, axis=0).ravel(),
+                     np.roll(idx, 1, axis=1).ravel(), np.roll(idx, -1, axis=1).ravel()], axis=1)
+
+# Wolff single-cluster update: grow a cluster of equal spins from a random
+# seed, adding each aligned neighbour with p_add = 1 - exp(-2J/kT), then flip
+# it. The cluster is grown breadth-first over flat indices, one frontier at a
+# time, so each layer of the BFS is a single array operation.
+def wolff_step(spins, T, rng, nbr=None):
+    L = spins.shape[0]
+    if nbr is None:
+        nbr = neighbor_table(L)
+    flat = spins.reshape(-1)
+    p_add = 1.0 - np.exp(-2.0 * J / (kB * T))
+
+    seed = rng.integers(L * L)
+    s0 = flat[seed]
+    in_cluster = np.zeros(L * L, dtype=bool)
+    in_cluster[seed] = True
+    frontier = np.array([seed])
+    while frontier.size:
+        cand = nbr[frontier].ravel()
+        ok = (flat[cand] == s0) & ~in_cluster[cand] & (rng.random(cand.size) < p_add)
+        frontier = np.unique(cand[ok])
+        in_cluster[frontier] = True
+
+    cluster = np.flatnonzero(in_cluster)
+    # energy change from the bonds that cross the cluster boundary
+    nbs = nbr[cluster]
+    outside = ~in_cluster[nbs]
+    dE = 2 * J * s0 * np.sum(flat[nbs][outside])
+    flat[cluster] *= -1
+    return dE, -2 * int(s0) * cluster.size
+
+# Union-find roots for all sites at once: hook the larger root of every
+# active bond onto the smaller one, compress paths, repeat until stable
+def _union_find(parent, a, b):
+    while True:
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+        ra, rb = parent[a], parent[b]
+        differ = ra != rb
+        if not differ.any():
+            return parent
+        lo, hi = np.minimum(ra, rb)[differ], np.maximum(ra, rb)[differ]
+        np.minimum.at(parent, hi, lo)
+
+# Swendsen-Wang update: activate bonds between aligned neighbours with
+# p_add, label the clusters with union-find, flip each cluster with prob 1/2
+def swendsen_wang_step(spins, T, rng, nbr=None):
+    L = spins.shape[0]
+    if nbr is None:
+        nbr = neighbor_table(L)
+    flat = spins.reshape(-1)
+    p_add = 1.0 - np.exp(-2.0 * J / (kB * T))
+    E_old, M_old = compute_energy(spins), compute_magnetization(spins)
+
+    sites = np.arange(L * L)
+    a_list, b_list = [], []
+    for k in (1, 3):   # down and right bonds: every bond once
+        other = nbr[:, k]
+        active = (flat == flat[other]) & (rng.random(L * L) < p_add)
+        a_list.append(sites[active])
+        b_list.append(other[active])
+    roots = _union_find(sites.copy(), np.concatenate(a_list), np.concatenate(b_list))
+
+    flip_cluster = rng.random(L * L) < 0.5
+    flat[flip_cluster[roots]] *= -1
+    return compute_energy(spins) - E_old, compute_magnetization(spins) - M_old
+
+# Integrated autocorrelation time of a series (Sokal's automatic window, c=5)
+def autocorr_time(x, c=5.0):
+    x = np.asarray(x, dtype=float) - np.mean(x)
+    n = x.size
+    nfft = 1 << (2 * n - 1).bit_length()
+    f = np.fft.rfft(x, n=nfft)
+    acf = np.fft.irfft(f * np.conj(f), n=nfft)[:n]
+    if acf[0] == 0:
+        return 0.5
+    rho = acf / acf[0]
+    tau = 0.5
+    for t in range(1, n):
+        tau += rho[t]
+        if t >= c * tau:
+            break
+    return tau
+
+UPDATES = {
+    "metropolis": lambda spins, T, rng, nbr: checkerboard_step(spins, T, rng),
+    "wolff": wolff_step,
+    "swendsen-wang": swendsen_wang_step,
+}
+
+# Autocorrelation time of |M| at T_c for each update mode, in updates and
+# in CPU seconds per independent sample (2 tau x seconds per update)
+def compare_cluster_updates(L=32, T=2.269, n_updates=4000, n_burn=500, seed=0):
+    rng = np.random.default_rng(seed)
+    nbr = neighbor_table(L)
+    print(f"{'update':<15}{'tau_int |M|':>13}{'s/update':>11}{'s/indep. sample':>17}")
+    results = {}
+    for name, update in UPDATES.items():
+        spins = rng.choice([-1, 1], size=(L, L))
+        for _ in range(n_burn):
+            update(spins, T, rng, nbr)
+        M = compute_magnetization(spins)
+        series = np.empty(n_updates)
+        t0 = time.perf_counter()
+        for k in range(n_updates):
+            _, dM = update(spins, T, rng, nbr)
+            M += dM
+            series[k] = abs(M)
+        t_update = (time.perf_counter() - t0) / n_updates
+        tau = autocorr_time(series)
+        results[name] = (tau, t_update)
+        print(f"{name:<15}{tau:>13.2f}{t_update:>11.5f}{2 * tau * t_update:>17.5f}")
+    return results
 
-# Track energy over time
-energies = []
-steps = []
+# Seconds per sweep of the single-spin loop vs the checkerboard update
+def benchmark_sweeps(L=256, T=2.0, n_sweeps=5, seed=0):
+    rng = np.random.default_rng(seed)
+    spins = rng.choice([-1, 1], size=(L, L))
 
-# Main simulation loop
-for step in range(n_steps):
+    t0 = time.perf_counter()
     metropolis_step(spins, T)
-    if step % 1000 == 0:
-        E = compute_energy(spins)
-        energies.append(E)
-        steps.append(step)
-
-# --- Plot results ---
-
-# 1. Initial Configuration
-plt.figure(figsize=(5,5))
-plt.imshow(initial_spins, cmap='gray', interpolation='nearest')
-plt.title('Initial Configuration')
-plt.axis('off')
-plt.show()
-
-# 2. Final Configuration
-plt.figure(figsize=(5,5))
-plt.imshow(spins, cmap='gray', interpolation='nearest')
-plt.title(f'Final Configuration at T = {T}')
-plt.axis('off')
-plt.show()
-
-# 3. Energy Plot
-plt.figure(figsize=(7,4))
-plt.plot(steps, energies, color='blue')
-plt.xlabel('Monte Carlo Steps')
-plt.ylabel('Energy')
-plt.title('Energy vs Monte Carlo Steps')
-plt.grid(True)
-plt.tight_layout()
-plt.show()
+    t_single = time.perf_counter() - t0
+
+    table, masks = boltzmann_table(T), checkerboard_masks(L)
+    t0 = time.perf_counter()
+    for _ in range(n_sweeps):
+        checkerboard_step(spins, T, rng, table, masks)
+    t_checker = (time.perf_counter() - t0) / n_sweeps
+
+    print(f"L={L}: single-spin {t_single:.4f} s/sweep, "
+          f"checkerboard {t_checker:.5f} s/sweep, speedup {t_single / t_checker:.0f}x")
+    return t_single, t_checker
+
+
+def main():
+    rng = np.random.default_rng()
+
+    # Initialize the spin lattice randomly
+    spins = np.random.choice([-1, 1], size=(L, L))
+
+    # Save initial configuration
+    initial_spins = spins.copy()
+
+    # Track energy and magnetization over time: running totals updated
+    # with (dE, dM) from each sweep, so recording every sweep costs O(1)
+    E = compute_energy(spins)
+    M = compute_magnetization(spins)
+    energies = np.empty(n_steps)
+    magnetizations = np.empty(n_steps)
+    steps = np.arange(n_steps)
+
+    # Main simulation loop (checkerboard Metropolis, one sweep per step)
+    table, masks = boltzmann_table(T), checkerboard_masks(L)
+    for step in range(n_steps):
+        dE, dM = checkerboard_step(spins, T, rng, table, masks)
+        E += dE
+        M += dM
+        energies[step] = E
+        magnetizations[step] = M
+
+    # Validate the running totals against a full recount
+    assert np.isclose(E, compute_energy(spins)), "incremental energy drifted"
+    assert M == compute_magnetization(spins), "incremental magnetization drifted"
+
+    benchmark_sweeps()
+    compare_cluster_updates()
+
+    # --- Plot results ---
+
+    # 1. Initial Configuration
+    plt.figure(figsize=(5,5))
+    plt.imshow(initial_spins, cmap='gray', interpolation='nearest')
+    plt.title('Initial Configuration')
+    plt.axis('off')
+    plt.show()
+
+    # 2. Final Configuration
+    plt.figure(figsize=(5,5))
+    plt.imshow(spins, cmap='gray', interpolation='nearest')
+    plt.title(f'Final Configuration at T = {T}')
+    plt.axis('off')
+    plt.show()
+
+    # 3. Energy Plot
+    plt.figure(figsize=(7,4))
+    plt.plot(steps, energies, color='blue')
+    plt.xlabel('Monte Carlo Steps')
+    plt.ylabel('Energy')
+    plt.title('Energy vs Monte Carlo Steps')
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+    # 4. Magnetization per spin
+    plt.figure(figsize=(7,4))
+    plt.plot(steps, magnetizations / (L * L), color='red')
+    plt.xlabel('Monte Carlo Steps')
+    plt.ylabel('Magnetization per spin')
+    plt.title('Magnetization vs Monte Carlo Steps')
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
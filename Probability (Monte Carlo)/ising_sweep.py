@@ -0,0 +1,245 @@
+"""
+Temperature sweep and parallel tempering for the 2D Ising model.
+
+Runs a grid of temperatures in one command and returns, per temperature,
+  e   = <E>/N                        energy per spin
+  m   = <|M|>/N                      magnetization per spin
+  C   = (<E^2> - <E>^2) / (N T^2)    specific heat per spin
+  chi = (<M^2> - <|M|>^2) / (N T)    susceptibility per spin
+with error bars from a blocking analysis (e, m) and a block jackknife
+(C, chi, which are non-linear in the samples).
+
+Two modes:
+  - independent : every temperature runs in its own process, each with its
+                  own SeedSequence child stream
+  - --pt        : parallel tempering (replica exchange). All replicas are
+                  stacked into one (R, L, L) array and updated together with
+                  the checkerboard rule; neighbouring temperatures try to swap
+                  configurations after every sweep.
+
+Usage:
+  python ising_sweep.py --L 32 --nt 16 --sweeps 20000
+  python ising_sweep.py --L 32 --nt 16 --sweeps 20000 --pt
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from ising_model import (J, UPDATES, boltzmann_table, checkerboard_masks,
+                         compute_energy, compute_magnetization, neighbor_table)
+
+
+def blocking_error(x, min_blocks=32):
+    """
+    Standard error of the mean of a correlated series (Flyvbjerg-Petersen):
+    average neighbouring pairs repeatedly and keep the largest error estimate
+    while at least min_blocks blocks remain.
+    """
+    x = np.asarray(x, dtype=float)
+    best = x.std(ddof=1) / np.sqrt(x.size)
+    while x.size // 2 >= min_blocks:
+        x = 0.5 * (x[: x.size // 2 * 2 : 2] + x[1 : x.size // 2 * 2 : 2])
+        best = max(best, x.std(ddof=1) / np.sqrt(x.size))
+    return best
+
+
+def block_jackknife(func, series, n_blocks=32):
+    """
+    Jackknife error of func(*series) using n_blocks contiguous blocks,
+    for estimators such as variances that are not plain means.
+    """
+    n = len(series[0]) // n_blocks * n_blocks
+    blocks = [np.asarray(s[:n], dtype=float).reshape(n_blocks, -1) for s in series]
+    keep = np.ones(n_blocks, dtype=bool)
+    values = np.empty(n_blocks)
+    for k in range(n_blocks):
+        keep[k] = False
+        values[k] = func(*[b[keep].ravel() for b in blocks])
+        keep[k] = True
+    return np.sqrt((n_blocks - 1) * np.mean((values - values.mean()) ** 2))
+
+
+def observables(E, M, T, N):
+    """
+    Observables with error bars from the per-sweep series E(t), M(t).
+
+    Returns a dict name -> (value, error).
+    """
+    absM = np.abs(M)
+    heat = lambda e: e.var() / (N * T**2)
+    susc = lambda m: (np.mean(m**2) - np.mean(m) ** 2) / (N * T)
+    return {
+        "e": (E.mean() / N, blocking_error(E) / N),
+        "m": (absM.mean() / N, blocking_error(absM) / N),
+        "C": (heat(E), block_jackknife(heat, [E])),
+        "chi": (susc(absM), block_jackknife(susc, [absM])),
+    }
+
+
+def run_temperature(task):
+    """Worker: equilibrate and measure one temperature with its own stream."""
+    L, T, n_sweeps, n_burn, method, seed_seq = task
+    rng = np.random.default_rng(seed_seq)
+    nbr = neighbor_table(L)
+    update = UPDATES[method]
+
+    spins = rng.choice([-1, 1], size=(L, L))
+    for _ in range(n_burn):
+        update(spins, T, rng, nbr)
+
+    E, M = compute_energy(spins), compute_magnetization(spins)
+    E_series = np.empty(n_sweeps)
+    M_series = np.empty(n_sweeps)
+    for k in range(n_sweeps):
+        dE, dM = update(spins, T, rng, nbr)
+        E += dE
+        M += dM
+        E_series[k], M_series[k] = E, M
+    return E_series, M_series
+
+
+def temperature_sweep(L, temps, n_sweeps=10_000, n_burn=1_000, method="metropolis",
+                      workers=None, seed=None):
+    """
+    Independent runs over a grid of temperatures, one process per temperature.
+
+    Returns a dict name -> (values, errors) arrays over temps.
+    """
+    children = np.random.SeedSequence(seed).spawn(len(temps))
+    tasks = [(L, T, n_sweeps, n_burn, method, s) for T, s in zip(temps, children)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            runs = list(pool.map(run_temperature, tasks))
+    else:
+        runs = [run_temperature(t) for t in tasks]
+
+    return _collect([observables(E, M, T, L * L) for (E, M), T in zip(runs, temps)])
+
+
+def _checkerboard_stack(spins, tables, masks, rng):
+    """
+    Checkerboard sweep of R stacked lattices (R, L, L), one temperature per
+    replica. tables has shape (R, 5). Returns dE, dM arrays of shape (R,).
+    """
+    R = spins.shape[0]
+    dE = np.zeros(R)
+    dM = np.zeros(R, dtype=np.int64)
+    rows = np.arange(R)[:, None, None]
+    for mask in masks:
+        neighbors = np.roll(spins, 1, axis=1) + np.roll(spins, -1, axis=1) + \
+                    np.roll(spins, 1, axis=2) + np.roll(spins, -1, axis=2)
+        local = spins * neighbors
+        p_accept = tables[rows, (local + 4) // 2]
+        flip = mask & (rng.random(spins.shape) < p_accept)
+        dE += 2 * J * np.sum(np.where(flip, local, 0), axis=(1, 2))
+        dM -= 2 * np.sum(np.where(flip, spins, 0), axis=(1, 2))
+        spins[flip] *= -1
+    return dE, dM
+
+
+def parallel_tempering(L, temps, n_sweeps=10_000, n_burn=1_000, seed=None):
+    """
+    Replica exchange over sorted temps. After every sweep, neighbouring
+    replicas (alternating even/odd pairs) swap configurations with probability
+    min(1, exp((1/T_i - 1/T_j)(E_i - E_j))).
+
+    Returns (observables dict as in temperature_sweep, swap acceptance per pair).
+    """
+    temps = np.asarray(temps, dtype=float)
+    R = temps.size
+    rng = np.random.default_rng(seed)
+    tables = np.stack([boltzmann_table(T) for T in temps])
+    masks = checkerboard_masks(L)
+    beta = 1.0 / temps
+
+    spins = rng.choice([-1, 1], size=(R, L, L))
+    E = np.array([compute_energy(s) for s in spins], dtype=float)
+    M = np.array([compute_magnetization(s) for s in spins], dtype=np.int64)
+    E_series = np.empty((n_sweeps, R))
+    M_series = np.empty((n_sweeps, R))
+    swaps = np.zeros(R - 1)
+    tries = np.zeros(R - 1)
+
+    for k in range(n_burn + n_sweeps):
+        dE, dM = _checkerboard_stack(spins, tables, masks, rng)
+        E += dE
+        M += dM
+
+        i = np.arange(k % 2, R - 1, 2)
+        log_acc = (beta[i] - beta[i + 1]) * (E[i] - E[i + 1])
+        ok = np.log(rng.random(i.size)) < log_acc
+        a, b = i[ok], i[ok] + 1
+        spins[a], spins[b] = spins[b].copy(), spins[a].copy()
+        E[a], E[b] = E[b], E[a].copy()
+        M[a], M[b] = M[b], M[a].copy()
+
+        if k >= n_burn:
+            E_series[k - n_burn] = E
+            M_series[k - n_burn] = M
+            tries[i] += 1
+            swaps[i[ok]] += 1
+
+    obs = [observables(E_series[:, r], M_series[:, r], T, L * L) for r, T in enumerate(temps)]
+    return _collect(obs), swaps / np.maximum(tries, 1)
+
+
+def _collect(obs):
+    """List of per-temperature dicts -> dict name -> (values, errors)."""
+    return {name: (np.array([o[name][0] for o in obs]), np.array([o[name][1] for o in obs]))
+            for name in obs[0]}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--L", type=int, default=32)
+    ap.add_argument("--tmin", type=float, default=1.5)
+    ap.add_argument("--tmax", type=float, default=3.5)
+    ap.add_argument("--nt", type=int, default=16, help="number of temperatures")
+    ap.add_argument("--sweeps", type=int, default=10_000)
+    ap.add_argument("--burn", type=int, default=1_000)
+    ap.add_argument("--method", choices=sorted(UPDATES), default="metropolis")
+    ap.add_argument("--pt", action="store_true", help="parallel tempering (replica exchange)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=2026)
+    args = ap.parse_args()
+
+    temps = np.linspace(args.tmin, args.tmax, args.nt)
+    t0 = time.time()
+    if args.pt:
+        obs, swap_rate = parallel_tempering(args.L, temps, args.sweeps, args.burn, args.seed)
+        print(f"swap acceptance per pair: {np.array2string(swap_rate, precision=2)}")
+    else:
+        obs = temperature_sweep(args.L, temps, args.sweeps, args.burn, args.method,
+                                args.workers, args.seed)
+    print(f"[OK] L={args.L}, {args.nt} temperatures, {args.sweeps:,} sweeps, "
+          f"time={time.time() - t0:.1f}s\n")
+
+    print(f"{'T':>6}" + "".join(f"{name:>22}" for name in obs))
+    for k, T in enumerate(temps):
+        row = "".join(f"{obs[n][0][k]:>12.4f} ± {obs[n][1][k]:<7.4f}" for n in obs)
+        print(f"{T:>6.3f}{row}")
+
+    labels = {"e": "Energy per spin", "m": "|M| per spin",
+              "C": "Specific heat per spin", "chi": "Susceptibility per spin"}
+    fig, axes = plt.subplots(2, 2, figsize=(10, 7))
+    for ax, name in zip(axes.ravel(), obs):
+        ax.errorbar(temps, obs[name][0], yerr=obs[name][1], fmt="o-", capsize=3)
+        ax.axvline(2.269, linestyle="--", color="gray")
+        ax.set_xlabel("T")
+        ax.set_ylabel(labels[name])
+        ax.grid(True, alpha=0.3)
+    fig.suptitle(f"2D Ising model, L = {args.L}" + (" (parallel tempering)" if args.pt else ""))
+    plt.tight_layout()
+    plt.savefig("ising_phase_diagram.png")
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+import time
+
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -27,10 +29,265 @@ def areaMCMC(a,b,hops=10_000):
             current = movement
     return samples
 
-samples = areaMCMC(a=0,b=3)
 
-answer = sum(samples)/len(samples)
-print(answer)
+def log_func(x, a, b):
+    """Vectorized log of func: -log(1 + x^2) on (a, b), -inf outside."""
+    x = np.asarray(x, dtype=float)
+    inside = (a < x) & (x < b)
+    out = np.full(x.shape, -np.inf)
+    out[inside] = -np.log1p(x[inside] ** 2)
+    return out
+
+
+def metropolis_chains(logpdf, x0, n_samples, step=0.25, n_burn=1_000,
+                      target_accept=0.44, adapt_every=50, seed=None):
+    """
+    Random-walk Metropolis that advances K chains at once.
+
+    logpdf : vectorized log density, logpdf(x) for x of shape (K,) or (K, d) -> (K,)
+    x0     : starting points, shape (K,) or (K, d)
+    step   : initial half-width of the uniform proposal (one per chain after adaptation)
+
+    During the n_burn burn-in steps each chain's proposal width is adapted
+    towards target_accept; it is then frozen, so the kept samples come from
+    a proper Metropolis chain.
+
+    Returns:
+      samples (n_samples, K[, d]), acceptance rate per chain (K,), final step widths (K,)
+    """
+    rng = np.random.default_rng(seed)
+    x = np.array(x0, dtype=float)
+    K = x.shape[0]
+    bshape = (K,) + (1,) * (x.ndim - 1)   # broadcast per-chain values over d
+    logp = logpdf(x)
+    width = np.full(K, float(step))
+    samples = np.empty((n_samples,) + x.shape)
+    accepted = np.zeros(K)
+
+    n_adapt = 0
+    for i in range(n_burn + n_samples):
+        proposal = x + width.reshape(bshape) * rng.uniform(-1.0, 1.0, size=x.shape)
+        logp_new = logpdf(proposal)
+        # log(u) <= log(p_new / p_old), written to avoid overflow
+        accept = np.log(rng.random(K)) <= logp_new - logp
+        x = np.where(accept.reshape(bshape), proposal, x)
+        logp = np.where(accept, logp_new, logp)
+
+        if i < n_burn:
+            accepted += accept
+            n_adapt += 1
+            if n_adapt == adapt_every:
+                rate = accepted / adapt_every
+                width *= np.exp(rate - target_accept)
+                accepted[:] = 0.0
+                n_adapt = 0
+            if i == n_burn - 1:
+                accepted[:] = 0.0
+        else:
+            samples[i - n_burn] = x
+            accepted += accept
+
+    return samples, accepted / max(n_samples, 1), width
+
+
+def fd_grad(logpdf, h=1e-5):
+    """
+    Central finite-difference gradient of a vectorized log density.
+    Non-finite components (e.g. next to the edge of the support) are set to 0;
+    trajectories that leave the support are then rejected by the Metropolis test.
+    """
+    def grad(x):
+        flat = x.reshape(x.shape[0], -1)
+        g = np.zeros_like(flat)
+        with np.errstate(invalid="ignore"):
+            for j in range(flat.shape[1]):
+                e = np.zeros_like(flat)
+                e[:, j] = h
+                g[:, j] = (logpdf((flat + e).reshape(x.shape)) -
+                           logpdf((flat - e).reshape(x.shape))) / (2.0 * h)
+        g[~np.isfinite(g)] = 0.0
+        return g.reshape(x.shape)
+    return grad
+
+
+def hmc_chains(logpdf, x0, n_samples, grad=None, n_leapfrog=10, step=0.1,
+               n_burn=1_000, target_accept=0.65, seed=None):
+    """
+    Hamiltonian Monte Carlo that advances K chains at once.
+
+    logpdf     : vectorized log density, same convention as metropolis_chains
+    grad       : gradient of logpdf, same shape as x; finite differences if None
+    n_leapfrog : leapfrog steps per trajectory
+    step       : initial leapfrog step size
+
+    The step size of every chain is tuned during burn-in with the dual-averaging
+    scheme of Hoffman & Gelman (2014) towards target_accept, then frozen.
+
+    Returns:
+      samples (n_samples, K[, d]), acceptance rate per chain (K,), final step sizes (K,)
+    """
+    rng = np.random.default_rng(seed)
+    grad = grad if grad is not None else fd_grad(logpdf)
+    x = np.array(x0, dtype=float)
+    K = x.shape[0]
+    bshape = (K,) + (1,) * (x.ndim - 1)
+    dims = tuple(range(1, x.ndim))
+
+    logp = logpdf(x)
+    g = grad(x)
+    samples = np.empty((n_samples,) + x.shape)
+    accepted = np.zeros(K)
+
+    # dual averaging state (gamma, t0, kappa as recommended in the paper)
+    gamma, t0, kappa = 0.05, 10.0, 0.75
+    eps = np.full(K, float(step))
+    mu = np.log(10.0 * eps)
+    h_bar = np.zeros(K)
+    log_eps_bar = np.zeros(K)
+
+    for i in range(n_burn + n_samples):
+        p0 = rng.standard_normal(x.shape)
+        e = eps.reshape(bshape)
+
+        # leapfrog: half kick, (drift, kick) x L, last kick is a half kick
+        x_new = x
+        p = p0 + 0.5 * e * g
+        for l in range(n_leapfrog):
+            x_new = x_new + e * p
+            g_new = grad(x_new)
+            if l < n_leapfrog - 1:
+                p = p + e * g_new
+        p = p + 0.5 * e * g_new
+
+        logp_new = logpdf(x_new)
+        with np.errstate(invalid="ignore", over="ignore"):
+            log_ratio = logp_new - logp - 0.5 * np.sum(p**2, axis=dims) + 0.5 * np.sum(p0**2, axis=dims)
+        log_ratio = np.where(np.isnan(log_ratio), -np.inf, log_ratio)
+        accept = np.log(rng.random(K)) <= log_ratio
+
+        x = np.where(accept.reshape(bshape), x_new, x)
+        logp = np.where(accept, logp_new, logp)
+        g = np.where(accept.reshape(bshape), g_new, g)
+
+        if i < n_burn:
+            m = i + 1
+            alpha = np.exp(np.minimum(log_ratio, 0.0))
+            h_bar = (1 - 1 / (m + t0)) * h_bar + (target_accept - alpha) / (m + t0)
+            log_eps = mu - np.sqrt(m) / gamma * h_bar
+            log_eps_bar = m ** (-kappa) * log_eps + (1 - m ** (-kappa)) * log_eps_bar
+            eps = np.exp(log_eps)
+            if i == n_burn - 1:
+                eps = np.exp(log_eps_bar)
+        else:
+            samples[i - n_burn] = x
+            accepted += accept
+
+    return samples, accepted / max(n_samples, 1), eps
+
+
+def rhat(samples):
+    """
+    Split R-hat (Gelman-Rubin) for samples of shape (n, K).
+    Values close to 1 (< 1.01) mean the chains agree.
+    """
+    n = samples.shape[0] // 2
+    split = np.concatenate([samples[:n], samples[n:2 * n]], axis=1)
+    W = split.var(axis=0, ddof=1).mean()
+    B = n * split.mean(axis=0).var(ddof=1)
+    var_hat = (n - 1) / n * W + B / n
+    return np.sqrt(var_hat / W)
+
+
+def ess(samples):
+    """
+    Effective sample size of samples (n, K) from the combined autocorrelation
+    of all chains, truncated with Geyer's initial positive sequence.
+    """
+    n, K = samples.shape
+    centered = samples - samples.mean(axis=0)
+    # autocovariance of every chain via FFT (zero padded to avoid wrap-around)
+    nfft = 1 << (2 * n - 1).bit_length()
+    spec = np.fft.rfft(centered, n=nfft, axis=0)
+    acov = np.fft.irfft(spec * np.conj(spec), n=nfft, axis=0)[:n] / n
+
+    W = samples.var(axis=0, ddof=1).mean()
+    var_hat = (n - 1) / n * W + (samples.mean(axis=0).var(ddof=1) if K > 1 else 0.0)
+    rho = 1.0 - (W - acov.mean(axis=1)) / var_hat
+
+    tau = -1.0
+    for t in range(0, n - 1, 2):
+        pair = rho[t] + rho[t + 1]
+        if pair < 0:
+            break
+        tau += 2.0 * pair
+    return n * K / tau
+
+
+def main():
+    a, b = 0, 3
+
+    # Original single-chain Python loop
+    t0 = time.time()
+    samples = areaMCMC(a=a,b=b)
+    t_loop = time.time() - t0
+    answer = sum(samples)/len(samples)
+    print(f"areaMCMC:  <x> = {answer:.5f}  ({len(samples):,} samples, {t_loop:.2f}s)")
+
+    # Vectorized: 100 chains x 100,000 steps = 10^7 samples
+    K, n = 100, 100_000
+    rng = np.random.default_rng(0)
+    t0 = time.time()
+    chains, acc, width = metropolis_chains(lambda x: log_func(x, a, b),
+                                           rng.uniform(a, b, size=K), n, seed=1)
+    t_vec = time.time() - t0
+
+    # Exact <x> = ln(1 + b^2) / (2 arctan b) for a = 0
+    exact = np.log(1 + b**2) / (2 * np.arctan(b))
+    print(f"vectorized: <x> = {chains.mean():.5f}  ({chains.size:,} samples, {t_vec:.2f}s)")
+    print(f"exact:      <x> = {exact:.5f}")
+    print(f"acceptance = {acc.mean():.3f}, proposal width = {width.mean():.3f}")
+    print(f"R-hat = {rhat(chains):.4f}, ESS = {ess(chains):,.0f}")
+
+    compare_samplers()
+
+    plt.hist(chains.ravel(), bins=100, density=True)
+    plt.show()
+
+
+def min_ess(samples):
+    """Smallest ESS over the coordinates of samples (n, K[, d])."""
+    flat = samples.reshape(samples.shape[0], samples.shape[1], -1)
+    return min(ess(flat[:, :, j]) for j in range(flat.shape[2]))
+
+
+def compare_samplers(K=50, n=4_000, seed=0):
+    """Effective samples per second: random-walk Metropolis vs HMC."""
+    rng = np.random.default_rng(seed)
+
+    # 1) the 1D target of areaMCMC, finite-difference gradient
+    a, b = 0, 3
+    targets = [("1/(1+x^2) on (0,3)", lambda x: log_func(x, a, b), None,
+                rng.uniform(a, b, size=K))]
+
+    # 2) 20-dimensional Gaussian with scales 0.1 ... 1, analytic gradient
+    scales = np.linspace(0.1, 1.0, 20)
+    targets.append(("20-d Gaussian",
+                    lambda x: -0.5 * np.sum((x / scales) ** 2, axis=1),
+                    lambda x: -x / scales**2,
+                    rng.standard_normal((K, scales.size))))
+
+    print(f"{'target':<22}{'sampler':<10}{'min ESS':>10}{'time s':>9}{'ESS/s':>11}")
+    for name, logpdf, grad, x0 in targets:
+        t0 = time.time()
+        s_rw, _, _ = metropolis_chains(logpdf, x0, n, seed=seed + 1)
+        t_rw = time.time() - t0
+        t0 = time.time()
+        s_hmc, _, _ = hmc_chains(logpdf, x0, n, grad=grad, seed=seed + 2)
+        t_hmc = time.time() - t0
+        for label, smp, t in (("RW", s_rw, t_rw), ("HMC", s_hmc, t_hmc)):
+            e = min_ess(smp)
+            print(f"{name:<22}{label:<10}{e:>10,.0f}{t:>9.2f}{e / t:>11,.0f}")
+
 
-#import matplotlib,pyplot as plt
-plt.hist(samples,density=True)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as mpl
 from scipy.integrate import simps
+from mc_integrate import mc_integrate
 
 def fn(x):
     return np.sin(x) + 1
@@ -15,8 +16,12 @@ width = 1.5 * np.pi - 0  # The width from 0 to 1.5pi
 samples = np.random.uniform(low=0, high=width, size=100000)
 mc_area = fn(samples).mean() * width
 
-#error using standard deviation
-error = np.std(samples * width) / np.sqrt(samples.size)
+#error using standard deviation of fn (not of the sample positions)
+error = width * np.std(fn(samples), ddof=1) / np.sqrt(samples.size)
+
+#adaptive Monte Carlo: draw in chunks until the standard error hits the target
+adaptive = mc_integrate(fn, [(0, width)], target_se=1e-3, seed=0)
+print(f"Adaptive MC area = {adaptive.value:0.4f} ± {adaptive.error:0.4f} (N={adaptive.n})")
 
 
 mpl.plot(xs, ys, label="Function")
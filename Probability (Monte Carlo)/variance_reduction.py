@@ -0,0 +1,195 @@
+"""
+Variance-reduction estimators for Monte Carlo integration over a box.
+
+All estimators use the same f(x), f(x, y), ... interface and bounds list as
+mc_integrate.py:
+  - importance_sampling : draw from a user proposal q, average f/q
+  - stratified          : jittered grid of strata, several points per stratum
+  - latin_hypercube     : LHS designs, error bar from independent replicas
+  - antithetic          : pairs (u, lo + hi - u)
+  - control_variate     : subtract c * (g - int g) for a g with known integral
+
+Each returns VRResult(value, error, n, var_reduction) where n is the number
+of function evaluations and var_reduction is
+
+    (plain MC variance per evaluation) / (this estimator's variance per evaluation),
+
+i.e. how many times fewer evaluations are needed for the same error bar.
+For importance sampling the plain variance comes from an extra uniform pilot
+run; the other methods place points uniformly on average, so the plain
+variance is estimated from their own function values.
+
+Usage:
+  python variance_reduction.py
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from scipy.stats import qmc
+
+
+VRResult = namedtuple("VRResult", ["value", "error", "n", "var_reduction"])
+
+
+def _box(bounds):
+    lo = np.array([b[0] for b in bounds], dtype=float)
+    hi = np.array([b[1] for b in bounds], dtype=float)
+    return lo, hi, np.prod(hi - lo)
+
+
+def _evaluate(f, pts):
+    """f on an (n, d) array of points, using the f(x, y, ...) interface."""
+    return f(*pts.T)
+
+
+def _result(value, var_est, n, plain_var):
+    """Pack an estimate; var_est is the variance of the estimator itself."""
+    return VRResult(value, np.sqrt(var_est), n, plain_var / (var_est * n))
+
+
+def plain_mc(f, bounds, n=10_000, seed=None):
+    """Uniform sampling, for reference (var_reduction = 1)."""
+    rng = np.random.default_rng(seed)
+    lo, hi, volume = _box(bounds)
+    y = volume * _evaluate(f, rng.uniform(lo, hi, size=(n, lo.size)))
+    var = y.var(ddof=1)
+    return _result(y.mean(), var / n, n, var)
+
+
+def importance_sampling(f, bounds, sample_q, pdf_q, n=10_000, n_pilot=10_000, seed=None):
+    """
+    Importance sampling with a user proposal.
+
+    sample_q(rng, n) -> (n, d) array of points drawn from q
+    pdf_q(pts)       -> q evaluated at those points
+
+    Points of q outside the box contribute zero, so q may have wider support.
+    """
+    rng = np.random.default_rng(seed)
+    lo, hi, volume = _box(bounds)
+
+    pts = np.asarray(sample_q(rng, n), dtype=float).reshape(n, lo.size)
+    inside = np.all((pts >= lo) & (pts <= hi), axis=1)
+    w = np.zeros(n)
+    w[inside] = _evaluate(f, pts[inside]) / pdf_q(pts[inside])
+    var = w.var(ddof=1)
+
+    pilot = volume * _evaluate(f, rng.uniform(lo, hi, size=(n_pilot, lo.size)))
+    return _result(w.mean(), var / n, n, pilot.var(ddof=1))
+
+
+def stratified(f, bounds, strata_per_dim=10, n_per_stratum=4, seed=None):
+    """
+    Stratified sampling on a regular grid of strata_per_dim^d cells,
+    with n_per_stratum uniform points in every cell (>= 2 for an error bar).
+    """
+    if n_per_stratum < 2:
+        raise ValueError("n_per_stratum must be >= 2 to estimate the variance.")
+    rng = np.random.default_rng(seed)
+    lo, hi, volume = _box(bounds)
+    d, k = lo.size, strata_per_dim
+    H = k**d
+
+    # lower corner (in units of cells) of every stratum, repeated per point
+    corners = np.stack(np.meshgrid(*[np.arange(k)] * d, indexing="ij"), axis=-1).reshape(H, d)
+    u = (corners[:, None, :] + rng.random((H, n_per_stratum, d))) / k
+    pts = lo + (hi - lo) * u.reshape(-1, d)
+
+    y = volume * _evaluate(f, pts).reshape(H, n_per_stratum)
+    n = H * n_per_stratum
+    var_est = np.sum(y.var(axis=1, ddof=1) / n_per_stratum) / H**2
+    return _result(y.mean(), var_est, n, y.var(ddof=1))
+
+
+def latin_hypercube(f, bounds, n=1_000, n_replicas=10, seed=None):
+    """
+    Latin hypercube sampling: each of the n slices in every dimension holds
+    exactly one point. The error bar comes from independent LHS designs.
+    """
+    lo, hi, volume = _box(bounds)
+    seeds = np.random.SeedSequence(seed).spawn(n_replicas)
+
+    estimates = np.empty(n_replicas)
+    all_y = []
+    for r in range(n_replicas):
+        u = qmc.LatinHypercube(lo.size, seed=np.random.default_rng(seeds[r])).random(n)
+        y = volume * _evaluate(f, lo + (hi - lo) * u)
+        estimates[r] = y.mean()
+        all_y.append(y)
+
+    var_est = estimates.var(ddof=1) / n_replicas
+    return _result(estimates.mean(), var_est, n * n_replicas, np.concatenate(all_y).var(ddof=1))
+
+
+def antithetic(f, bounds, n_pairs=5_000, seed=None):
+    """Antithetic pairs x and lo + hi - x; works best for monotone f."""
+    rng = np.random.default_rng(seed)
+    lo, hi, volume = _box(bounds)
+
+    pts = rng.uniform(lo, hi, size=(n_pairs, lo.size))
+    y1 = volume * _evaluate(f, pts)
+    y2 = volume * _evaluate(f, lo + hi - pts)
+    pair_mean = 0.5 * (y1 + y2)
+
+    var_est = pair_mean.var(ddof=1) / n_pairs
+    return _result(pair_mean.mean(), var_est, 2 * n_pairs, np.concatenate([y1, y2]).var(ddof=1))
+
+
+def control_variate(f, bounds, g, g_integral, n=10_000, seed=None):
+    """
+    Control variate: estimate int f - c (int_hat g - g_integral), with the
+    optimal c = cov(f, g) / var(g) fitted from the same samples.
+    """
+    rng = np.random.default_rng(seed)
+    lo, hi, volume = _box(bounds)
+
+    pts = rng.uniform(lo, hi, size=(n, lo.size))
+    y = volume * _evaluate(f, pts)
+    z = volume * _evaluate(g, pts)
+
+    c = np.cov(y, z)[0, 1] / z.var(ddof=1)
+    adjusted = y - c * (z - g_integral)
+
+    var_est = adjusted.var(ddof=1) / n
+    return _result(adjusted.mean(), var_est, n, y.var(ddof=1))
+
+
+if __name__ == "__main__":
+    # Group A benchmark: cos(pi x/2) cos(pi y/2) on [0,1]^2, exact 4/pi^2
+    def f(x, y):
+        return np.cos(0.5 * np.pi * x) * np.cos(0.5 * np.pi * y)
+
+    box = [(0.0, 1.0), (0.0, 1.0)]
+    exact = 4 / np.pi**2
+
+    # proposal roughly shaped like f: density (1 - x^2/2)(1 - y^2/2) / (5/6)^2
+    def sample_q(rng, n):
+        # inverse of the marginal CDF has no closed form: use rejection on [0,1]
+        out = np.empty((0, 2))
+        while len(out) < n:
+            cand = rng.random((2 * n, 2))
+            keep = rng.random(2 * n) < np.prod(1 - 0.5 * cand**2, axis=1)
+            out = np.vstack([out, cand[keep]])
+        return out[:n]
+
+    def pdf_q(pts):
+        return np.prod(1 - 0.5 * pts**2, axis=1) / (5.0 / 6.0) ** 2
+
+    # control variate with the same shape and known integral (5/6)^2
+    def g(x, y):
+        return (1 - 0.5 * x**2) * (1 - 0.5 * y**2)
+
+    results = {
+        "plain": plain_mc(f, box, n=10_000, seed=0),
+        "importance": importance_sampling(f, box, sample_q, pdf_q, n=10_000, seed=0),
+        "stratified": stratified(f, box, strata_per_dim=50, n_per_stratum=4, seed=0),
+        "latin hypercube": latin_hypercube(f, box, n=1_000, n_replicas=10, seed=0),
+        "antithetic": antithetic(f, box, n_pairs=5_000, seed=0),
+        "control variate": control_variate(f, box, g, (5.0 / 6.0) ** 2, n=10_000, seed=0),
+    }
+
+    print(f"exact = {exact:.8f}")
+    print(f"{'method':<17}{'estimate':>12}{'error':>12}{'evals':>8}{'var reduction':>15}")
+    for name, r in results.items():
+        print(f"{name:<17}{r.value:>12.8f}{r.error:>12.2e}{r.n:>8}{r.var_reduction:>15.1f}")
@@ -8,14 +8,26 @@ Recommended:
 Usage:
   python pi_compute.py --digits 1000000 --out pi_1e6.txt
   python pi_compute.py --digits 1000000 --out pi_1e6_with3.txt --with3
+  python pi_compute.py --digits 100000000 --out pi_1e8.txt --workers 8
+  python pi_compute.py --digits 100000000 --out pi_1e8.bcd --packed
+  python pi_compute.py --digits 1000000000 --out pi_1e9.txt --checkpoint pi_ckpt
 
 Notes:
 - Default output contains ONLY digits after decimal point.
+- Digits are streamed to the file block by block (divide-and-conquer radix
+  conversion), so the full decimal string is never held in memory.
+- --packed stores 2 digits per byte; read back with unpack_digits().
+- --checkpoint DIR saves finished subtrees of the binary splitting; rerun
+  the same command after a crash to continue where it stopped. The files
+  are kept until the digits are written.
 - Indexing for search: position 1 = first digit after decimal point.
 """
 
 import argparse
+import os
+import struct
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     import gmpy2
@@ -28,75 +40,370 @@ except ImportError as e:
     ) from e
 
 
+C3_OVER_24 = mpz(640320) ** 3 // 24  # 640320^3 / 24, hoisted out of bs()
+LEAF_TERMS = 16  # terms summed in a plain loop at the bottom of the split tree
+
+
+def bs_leaf(a: int, b: int):
+    """
+    (P, Q, T) for a short range of terms, accumulated term by term.
+
+    Numbers are still small here, so a loop beats splitting further and
+    saves the recursion overhead of the bottom levels of the tree.
+    """
+    P, Q, T = mpz(1), mpz(1), mpz(0)
+    for k in range(a, b):
+        if k == 0:
+            p, q = mpz(1), mpz(1)
+        else:
+            p = mpz((6 * k - 5) * (2 * k - 1) * (6 * k - 1))
+            q = mpz(k) ** 3 * C3_OVER_24
+        t = p * (13591409 + 545140134 * k)
+        if k & 1:
+            t = -t
+        # append term k: same combination rule as the merge step in bs()
+        T = T * q + t * P
+        P *= p
+        Q *= q
+    return P, Q, T
+
+
+def merge(left, right):
+    """Combine (P, Q, T) of two adjacent ranges, left first."""
+    P1, Q1, T1 = left
+    P2, Q2, T2 = right
+    return P1 * P2, Q1 * Q2, T1 * Q2 + T2 * P1
+
+
+def merge_all(level):
+    """Merge a list of adjacent (P, Q, T) triples pairwise until one is left."""
+    while len(level) > 1:
+        merged = [merge(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            merged.append(level[-1])
+        level = merged
+    return level[0]
+
+
 def bs(a: int, b: int):
     """
     Binary splitting for Chudnovsky series.
 
     Returns (P, Q, T) such that:
       sum_{k=a}^{b-1} term(k) = T / Q  (up to a shared factor)
+
+    Iterative: the range is cut into leaves of LEAF_TERMS terms, which are
+    merged like a binary counter (two results of the same height merge as
+    soon as both exist). This is the same balanced product tree as the
+    recursive split, and only O(log n) partial results are alive at a time.
     """
-    C3_OVER_24 = mpz(640320) ** 3 // 24  # 640320^3 / 24
+    stack = []  # (height, (P, Q, T)), heights strictly decreasing
+    for lo in range(a, b, LEAF_TERMS):
+        height, node = 0, bs_leaf(lo, min(lo + LEAF_TERMS, b))
+        while stack and stack[-1][0] == height:
+            _, left = stack.pop()
+            height, node = height + 1, merge(left, node)
+        stack.append((height, node))
+    node = stack.pop()[1]
+    while stack:
+        node = merge(stack.pop()[1], node)
+    return node
 
-    if b - a == 1:
-        k = a
-        if k == 0:
-            P = mpz(1)
-            Q = mpz(1)
+
+def _bs_task(task):
+    """Worker: one subtree, returned as gmpy2 binary strings (cheap to pickle)."""
+    a, b = task
+    return tuple(gmpy2.to_binary(x) for x in bs(a, b))
+
+
+def split_ranges(a: int, b: int, parts: int):
+    """Cut [a, b) into `parts` contiguous ranges of (almost) equal length."""
+    edges = [a + (b - a) * i // parts for i in range(parts + 1)]
+    return [(lo, hi) for lo, hi in zip(edges[:-1], edges[1:]) if hi > lo]
+
+
+def bs_parallel(a: int, b: int, workers: int = 1, parts: int = None):
+    """
+    bs(a, b) with the top of the tree farmed out to a process pool.
+
+    [a, b) is cut into `parts` subtrees (default 4 per worker, which
+    balances the later, more expensive terms). Workers return serialized
+    mpz values and the parent merges them in order, so the result equals
+    bs(a, b) exactly.
+    """
+    if workers <= 1:
+        return bs(a, b)
+    ranges = split_ranges(a, b, parts or 4 * workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts_done = [tuple(gmpy2.from_binary(x) for x in r) for r in pool.map(_bs_task, ranges)]
+    return merge_all(parts_done)
+
+
+def _save_node(path: str, node):
+    """Write (P, Q, T) with gmpy2.to_binary, atomically (temp file + rename)."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        for x in node:
+            blob = gmpy2.to_binary(x)
+            f.write(struct.pack("<Q", len(blob)))
+            f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _load_node(path: str):
+    with open(path, "rb") as f:
+        data = f.read()
+    node, pos = [], 0
+    for _ in range(3):
+        (n,) = struct.unpack_from("<Q", data, pos)
+        node.append(gmpy2.from_binary(data[pos + 8:pos + 8 + n]))
+        pos += 8 + n
+    return tuple(node)
+
+
+def _node_path(checkpoint_dir: str, lo: int, hi: int) -> str:
+    return os.path.join(checkpoint_dir, f"bs_{lo}_{hi}.bin")
+
+
+def clear_checkpoints(checkpoint_dir: str):
+    """Remove the subtree files written by bs_resumable."""
+    for name in os.listdir(checkpoint_dir):
+        if name.startswith("bs_") and name.endswith((".bin", ".tmp")):
+            os.remove(os.path.join(checkpoint_dir, name))
+
+
+def bs_resumable(a: int, b: int, checkpoint_dir: str, workers: int = 1, chunks: int = 64,
+                 progress: bool = True):
+    """
+    bs(a, b) that survives restarts.
+
+    [a, b) is cut into `chunks` subtrees, computed in order (in a process
+    pool if workers > 1), and merged like a binary counter, as in bs().
+    Every finished subtree, a chunk or a merged node, is saved to
+    checkpoint_dir/bs_<lo>_<hi>.bin, and its two children are then deleted,
+    so the directory holds O(log chunks) files. (P, Q, T) depend only on
+    the term range, so any saved node can be reused by a later run.
+
+    The root node bs_<a>_<b>.bin is saved as well and left in place; the
+    caller removes it with clear_checkpoints() once it is no longer needed.
+
+    On restart a saved root is returned directly. Otherwise the largest
+    saved node at each position is loaded, and only the missing chunks are
+    computed. Progress and a rough ETA (later terms cost more) are printed
+    from the number of completed terms.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    root_path = _node_path(checkpoint_dir, a, b)
+    if os.path.exists(root_path):
+        if progress:
+            print(f"[RESUME] all {b - a:,} terms loaded from {checkpoint_dir}")
+        return _load_node(root_path)
+
+    ranges = split_ranges(a, b, chunks)
+    n = len(ranges)
+
+    def span(i, h):
+        return ranges[i][0], ranges[i + (1 << h) - 1][1]
+
+    # plan: walk the chunks, taking the biggest finished subtree at each position
+    plan, i = [], 0
+    while i < n:
+        for h in range(n.bit_length(), -1, -1):
+            if i % (1 << h) == 0 and i + (1 << h) <= n and \
+                    os.path.exists(_node_path(checkpoint_dir, *span(i, h))):
+                plan.append(("load", i, h))
+                i += 1 << h
+                break
         else:
-            P = mpz((6 * k - 5) * (2 * k - 1) * (6 * k - 1))
-            Q = mpz(k) ** 3 * C3_OVER_24
+            plan.append(("compute", i, 0))
+            i += 1
 
-        T = P * (mpz(13591409) + mpz(545140134) * k)
-        if k & 1:
-            T = -T
-        return P, Q, T
+    todo = [ranges[i] for kind, i, _ in plan if kind == "compute"]
+    resumed = (b - a) - sum(hi - lo for lo, hi in todo)
+    if progress and resumed:
+        print(f"[RESUME] {resumed:,} of {b - a:,} terms loaded from {checkpoint_dir}")
 
-    m = (a + b) // 2
-    P1, Q1, T1 = bs(a, m)
-    P2, Q2, T2 = bs(m, b)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 and todo else None
+    try:
+        results = pool.map(_bs_task, todo) if pool else map(_bs_task, todo)
+        stack = []  # (height, first chunk, (P, Q, T))
+        t0, done = time.time(), 0
+        for kind, i, h in plan:
+            if kind == "load":
+                node = _load_node(_node_path(checkpoint_dir, *span(i, h)))
+            else:
+                node = tuple(gmpy2.from_binary(x) for x in next(results))
+                _save_node(_node_path(checkpoint_dir, *ranges[i]), node)
+                done += ranges[i][1] - ranges[i][0]
+                if progress:
+                    elapsed = time.time() - t0
+                    remaining = (b - a) - resumed - done
+                    print(f"[BS] {(resumed + done) / (b - a):6.1%} of {b - a:,} terms, "
+                          f"elapsed {elapsed:.1f}s, ETA {elapsed / done * remaining:.1f}s")
 
-    P = P1 * P2
-    Q = Q1 * Q2
-    T = T1 * Q2 + T2 * P1
-    return P, Q, T
+            while stack and stack[-1][0] == h:
+                _, j, left = stack.pop()
+                right_path = _node_path(checkpoint_dir, *span(i, h))
+                i, h, node = j, h + 1, merge(left, node)
+                _save_node(_node_path(checkpoint_dir, *span(i, h)), node)
+                os.remove(_node_path(checkpoint_dir, *span(j, h - 1)))
+                os.remove(right_path)
+            stack.append((h, i, node))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # chunks not a power of two: merge the leftover subtrees into the root
+    paths = [_node_path(checkpoint_dir, *span(i, h)) for h, i, _ in stack]
+    node = stack.pop()[2]
+    while stack:
+        node = merge(stack.pop()[2], node)
+    if len(paths) > 1:
+        _save_node(root_path, node)
+        for path in paths:
+            os.remove(path)
+    return node
 
 
-def compute_pi_fractional_digits(digits: int) -> str:
+def pi_fraction_integer(digits: int, workers: int = 1, checkpoint_dir: str = None) -> mpz:
     """
-    Compute pi and return exactly `digits` digits after the decimal point as a string.
+    The first `digits` digits after the decimal point as one integer,
+    floor(pi * 10^digits) - 3 * 10^digits.
+
+    With checkpoint_dir, the binary splitting runs through bs_resumable.
+    Its root node stays on disk, so a crash after this point does not cost
+    the series; write_pi_digits removes the files at the end.
     """
     # Guard digits protect against rounding/truncation at the tail.
     guard = 50
-    # bits ≈ decimal_digits * log2(10)
-    bits = int((digits + guard) * 3.3219280948873626)
-    gmpy2.get_context().precision = bits
+    scale = digits + guard
 
     # Each term contributes ~14 digits
     n_terms = digits // 14 + 2
 
     t0 = time.time()
-    P, Q, T = bs(0, n_terms)
-
-    sqrtC = gmpy2.sqrt(gmpy2.mpfr(10005))
-    pi = (gmpy2.mpfr(Q) * 426880 * sqrtC) / gmpy2.mpfr(T)
+    if checkpoint_dir:
+        P, Q, T = bs_resumable(0, n_terms, checkpoint_dir, workers)
+    else:
+        P, Q, T = bs_parallel(0, n_terms, workers)
+    del P
 
-    # Convert to decimal string with enough digits (includes "3.")
-    s = str(pi)
+    # pi = 426880 * sqrt(10005) * Q / T, rounded to `bits` like the mpz inputs
+    # bits ≈ decimal_digits * log2(10)
+    gmpy2.get_context().precision = int(scale * 3.3219280948873626) + 64
+    pi = gmpy2.mpfr(Q) * 426880 * gmpy2.sqrt(gmpy2.mpfr(10005)) / gmpy2.mpfr(T)
+    del Q, T
+    pi_scaled = gmpy2.mpz(gmpy2.floor(pi * mpz(10) ** scale))
+    del pi
+    frac = pi_scaled // mpz(10) ** guard - 3 * mpz(10) ** digits
     elapsed = time.time() - t0
 
-    if not s.startswith("3."):
-        raise RuntimeError(f"Unexpected pi format: {s[:20]}...")
-
-    frac = s.split(".", 1)[1]
-    if len(frac) < digits:
-        frac = frac.ljust(digits, "0")
-    else:
-        frac = frac[:digits]
+    if not 0 <= frac < mpz(10) ** digits:
+        raise RuntimeError("Unexpected pi value (integer part is not 3).")
 
     print(f"[OK] digits={digits:,}, terms={n_terms:,}, time={elapsed:.2f}s")
     return frac
 
 
+BLOCK_DIGITS = 1 << 14  # leaf size of the radix conversion
+
+
+class DigitSink:
+    """
+    Writes decimal digit strings to a binary file, as ASCII or packed
+    2 digits per byte (BCD, first digit in the high nibble). In packed mode
+    an odd final digit is padded with the nibble 0xF.
+    """
+
+    def __init__(self, f, packed: bool = False):
+        self.f = f
+        self.packed = packed
+        self.pending = ""
+
+    def write(self, s: str):
+        if not self.packed:
+            self.f.write(s.encode("ascii"))
+            return
+        s = self.pending + s
+        even = len(s) - len(s) % 2
+        self.f.write(bytes.fromhex(s[:even]))
+        self.pending = s[even:]
+
+    def close(self):
+        if self.pending:
+            self.f.write(bytes.fromhex(self.pending + "f"))
+            self.pending = ""
+
+
+def write_decimal(n: mpz, ndigits: int, sink: DigitSink):
+    """
+    Write n (0 <= n < 10^ndigits) as exactly ndigits zero-padded decimal digits.
+
+    Divide-and-conquer radix conversion: n is split as divmod(n, 10^m), with
+    m = BLOCK_DIGITS * 2^j, so only the powers 10^(BLOCK_DIGITS * 2^j) are
+    needed and each is computed once. The pieces are kept on a stack and
+    written high part first, as soon as they are below BLOCK_DIGITS digits,
+    so the whole string never exists in memory.
+    """
+    powers = {}
+
+    def pow10(m):
+        if m not in powers:
+            powers[m] = mpz(10) ** m if m == BLOCK_DIGITS else pow10(m // 2) ** 2
+        return powers[m]
+
+    stack = [(n, ndigits)]
+    del n
+    while stack:
+        x, nd = stack.pop()
+        if nd <= BLOCK_DIGITS:
+            sink.write(gmpy2.digits(x).zfill(nd) if nd else "")
+            continue
+        m = BLOCK_DIGITS
+        while 2 * m < nd:
+            m *= 2
+        hi, lo = gmpy2.t_divmod(x, pow10(m))
+        del x
+        stack.append((lo, m))
+        stack.append((hi, nd - m))
+
+
+def write_pi_digits(digits: int, path: str, with3: bool = False, packed: bool = False,
+                    workers: int = 1, checkpoint_dir: str = None):
+    """
+    Compute pi and stream the fractional digits to `path`.
+    Returns the number of bytes written.
+
+    The checkpoint files, if any, are removed only after the last digit
+    has been written.
+    """
+    with open(path, "wb") as f:
+        sink = DigitSink(f, packed)
+        if with3:
+            sink.write("3.")
+        # no local reference, so write_decimal can free the integer as it splits
+        write_decimal(pi_fraction_integer(digits, workers, checkpoint_dir), digits, sink)
+        sink.close()
+        n_bytes = f.tell()
+    if checkpoint_dir:
+        clear_checkpoints(checkpoint_dir)
+    return n_bytes
+
+
+def unpack_digits(data: bytes) -> str:
+    """Digits of a --packed file as a string (drops the 0xF pad nibble)."""
+    return data.hex().rstrip("f")
+
+
+def compute_pi_fractional_digits(digits: int, workers: int = 1) -> str:
+    """
+    Compute pi and return exactly `digits` digits after the decimal point as a string.
+    """
+    return gmpy2.digits(pi_fraction_integer(digits, workers)).zfill(digits)
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--digits", type=int, required=True,
@@ -104,21 +411,22 @@ def main():
     ap.add_argument("--out", type=str, required=True, help="Output file path")
     ap.add_argument("--with3", action="store_true",
                     help='Write "3."+digits instead of digits only')
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="processes for the binary splitting (1 = serial)")
+    ap.add_argument("--packed", action="store_true",
+                    help="Write 2 digits per byte (BCD) instead of ASCII")
+    ap.add_argument("--checkpoint", type=str, default=None,
+                    help="Directory for binary-splitting checkpoints (resume by rerunning)")
     args = ap.parse_args()
 
     if args.digits <= 0:
         raise SystemExit("digits must be positive.")
+    if args.packed and args.with3:
+        raise SystemExit("--packed files hold fractional digits only; drop --with3.")
 
-    frac = compute_pi_fractional_digits(args.digits)
-
-    with open(args.out, "w", encoding="utf-8") as f:
-        if args.with3:
-            f.write("3." + frac)
-        else:
-            f.write(frac)
-
-    print(f"[SAVED] {args.out} (length={len(frac) + (2 if args.with3 else 0):,} chars)")
-
+    n_bytes = write_pi_digits(args.digits, args.out, args.with3, args.packed, args.workers,
+                              args.checkpoint)
+    print(f"[SAVED] {args.out} (length={n_bytes:,} bytes)")
 
 if __name__ == "__main__":
     main()
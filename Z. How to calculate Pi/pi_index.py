@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Build a k-mer index of a pi digits file once, then answer pattern queries
+(first position, all positions, count) without rescanning the file.
+
+Index layout (a directory, all arrays saved as .npy and memory-mapped):
+- digits.npy    : uint8, one digit 0-9 per fractional digit
+- offsets.npy   : int64, 10^k + 1 entries; the positions of k-mer c are
+                  positions[offsets[c]:offsets[c+1]]
+- positions.npy : uint32 (uint64 above 4e9 digits), the start of every
+                  k-mer, grouped by k-mer value, ascending inside a group
+
+Queries, with m = len(pattern):
+- m == k : one slice of positions
+- m <  k : the k-mers that start with the pattern form one contiguous
+           range of offsets, so count is one subtraction and find_first a
+           minimum over the group heads; only find_all sorts the hits. The
+           last k-1 digits are checked directly
+- m >  k : candidates from the rarest k-mer inside the pattern, verified
+           against digits.npy
+
+Positions follow pi_search.py: 1 = first digit after the decimal point.
+
+Usage:
+  python pi_index.py build --file pi_1e6.txt --index pi_1e6.idx
+  python pi_index.py build --file pi_1e6_with3.txt --index pi_1e6.idx --file_has_3dot
+  python pi_index.py query --index pi_1e6.idx --pattern 040106 --all
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+K = 6
+CHUNK_DIGITS = 1 << 24
+
+
+def _read_digits(path: str, file_has_3dot: bool = False, packed: bool = False):
+    """Digits of the file as a uint8 array of 0-9."""
+    if packed:
+        raw = np.fromfile(path, dtype=np.uint8)
+        digits = np.empty(2 * raw.size, dtype=np.uint8)
+        digits[0::2] = raw >> 4
+        digits[1::2] = raw & 0x0F
+        if digits.size and digits[-1] == 0x0F:
+            digits = digits[:-1]  # pad nibble of an odd digit count
+        return digits
+    raw = np.fromfile(path, dtype=np.uint8)
+    if file_has_3dot:
+        raw = raw[2:]
+    raw = raw[(raw >= ord("0")) & (raw <= ord("9"))]  # drop newline etc.
+    return raw - np.uint8(ord("0"))
+
+
+def _kmer_codes(digits, start: int, stop: int, k: int):
+    """Integer value of the k-mers starting at start..stop-1."""
+    codes = np.zeros(stop - start, dtype=np.int64)
+    for j in range(k):
+        codes = codes * 10 + digits[start + j:stop + j]
+    return codes
+
+
+def build_index(path: str, index_dir: str, k: int = K, file_has_3dot: bool = False,
+                packed: bool = False, verbose: bool = True):
+    """
+    Build the index of `path` into index_dir (created if needed).
+
+    Two passes over the digits in chunks of CHUNK_DIGITS: count every
+    k-mer, then scatter the start positions into their groups. Only one
+    chunk of k-mer codes is in memory at a time; the position table is
+    written through a memory map.
+    """
+    t0 = time.time()
+    os.makedirs(index_dir, exist_ok=True)
+    digits = _read_digits(path, file_has_3dot, packed)
+    np.save(os.path.join(index_dir, "digits.npy"), digits)
+    n_kmers = max(digits.size - k + 1, 0)
+
+    counts = np.zeros(10**k, dtype=np.int64)
+    for start in range(0, n_kmers, CHUNK_DIGITS):
+        stop = min(start + CHUNK_DIGITS, n_kmers)
+        counts += np.bincount(_kmer_codes(digits, start, stop, k), minlength=10**k)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    np.save(os.path.join(index_dir, "offsets.npy"), offsets)
+
+    dtype = np.uint32 if digits.size < 2**32 else np.uint64
+    positions = np.lib.format.open_memmap(os.path.join(index_dir, "positions.npy"),
+                                          mode="w+", dtype=dtype, shape=(n_kmers,))
+    cursor = offsets[:-1].copy()
+    for start in range(0, n_kmers, CHUNK_DIGITS):
+        stop = min(start + CHUNK_DIGITS, n_kmers)
+        codes = _kmer_codes(digits, start, stop, k)
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        rank = np.arange(order.size) - np.searchsorted(sorted_codes, sorted_codes, side="left")
+        positions[cursor[sorted_codes] + rank] = order + start
+        cursor += np.bincount(codes, minlength=10**k)
+    positions.flush()
+    del positions
+
+    if verbose:
+        print(f"[INDEX] {digits.size:,} digits, k={k}, {index_dir} "
+              f"built in {time.time() - t0:.2f}s")
+
+
+class PiIndex:
+    """Memory-mapped k-mer index built by build_index()."""
+
+    def __init__(self, index_dir: str):
+        self.digits = np.load(os.path.join(index_dir, "digits.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(index_dir, "offsets.npy"), mmap_mode="r")
+        self.positions = np.load(os.path.join(index_dir, "positions.npy"), mmap_mode="r")
+        self.k = len(str(self.offsets.size - 2))  # 10^k + 1 offsets
+
+    def _groups(self, pattern: str):
+        """Range [lo, hi) of k-mer codes that start with a pattern of length <= k."""
+        if not pattern.isdigit():
+            raise ValueError("pattern must be digits only.")
+        lo = int(pattern) * 10 ** (self.k - len(pattern))
+        return lo, lo + 10 ** (self.k - len(pattern))
+
+    def _tail0(self, pattern: str):
+        """0-indexed starts in the last k-1 digits, which no k-mer covers."""
+        m, n = len(pattern), self.digits.size
+        tail_start = max(n - self.k + 1, 0)
+        tail = np.asarray(self.digits[tail_start:])
+        want = np.frombuffer(pattern.encode(), dtype=np.uint8) - ord("0")
+        return np.array([tail_start + i for i in range(tail.size - m + 1)
+                         if np.array_equal(tail[i:i + m], want)], dtype=np.int64)
+
+    def _all0(self, pattern: str):
+        """Sorted 0-indexed start positions of pattern."""
+        if not pattern.isdigit():
+            raise ValueError("pattern must be digits only.")
+        m, k, n = len(pattern), self.k, self.digits.size
+
+        if m <= k:
+            lo, hi = self._groups(pattern)
+            hits = np.asarray(self.positions[self.offsets[lo]:self.offsets[hi]], dtype=np.int64)
+            if m < k:
+                # groups are sorted inside, not across; tail starts come after every k-mer
+                hits = np.concatenate((np.sort(hits), self._tail0(pattern)))
+            return hits
+
+        # m > k: start from the rarest k-mer inside the pattern
+        codes = [int(pattern[o:o + k]) for o in range(m - k + 1)]
+        sizes = [self.offsets[c + 1] - self.offsets[c] for c in codes]
+        o = int(np.argmin(sizes))
+        c = codes[o]
+        cand = np.asarray(self.positions[self.offsets[c]:self.offsets[c + 1]], dtype=np.int64) - o
+        cand = cand[(cand >= 0) & (cand + m <= n)]
+        for j, ch in enumerate(pattern):
+            if cand.size == 0:
+                break
+            if o <= j < o + k:
+                continue  # already matched by the k-mer
+            cand = cand[self.digits[cand + j] == int(ch)]
+        return cand
+
+    def find_all(self, pattern: str):
+        """All 1-indexed fractional positions of pattern, ascending."""
+        return self._all0(pattern) + 1
+
+    def find_first(self, pattern: str):
+        """First 1-indexed fractional position of pattern, or None."""
+        if len(pattern) < self.k:
+            lo, hi = self._groups(pattern)
+            off = np.asarray(self.offsets[lo:hi + 1])
+            heads = off[:-1][off[1:] > off[:-1]]  # first entry of each non-empty group
+            if heads.size:
+                return int(np.asarray(self.positions[heads]).min()) + 1
+            tail = self._tail0(pattern)
+            return int(tail[0]) + 1 if tail.size else None
+        hits = self._all0(pattern)
+        return int(hits[0]) + 1 if hits.size else None
+
+    def count(self, pattern: str) -> int:
+        """Number of (possibly overlapping) occurrences of pattern."""
+        if len(pattern) <= self.k:
+            lo, hi = self._groups(pattern)
+            n = int(self.offsets[hi] - self.offsets[lo])
+            return n + self._tail0(pattern).size if len(pattern) < self.k else n
+        return int(self._all0(pattern).size)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    b = sub.add_parser("build", help="build the index of a digits file")
+    b.add_argument("--file", required=True, help="pi digits file")
+    b.add_argument("--index", required=True, help="index directory to create")
+    b.add_argument("--k", type=int, default=K, help="k-mer length (default 6)")
+    b.add_argument("--file_has_3dot", action="store_true", help='file begins with "3."')
+    b.add_argument("--packed", action="store_true", help="file written with pi_compute.py --packed")
+
+    q = sub.add_parser("query", help="look up a pattern")
+    q.add_argument("--index", required=True, help="index directory")
+    q.add_argument("--pattern", required=True, nargs="+", help="digit pattern(s), any length")
+    q.add_argument("--all", action="store_true", help="print every position")
+    q.add_argument("--count", action="store_true", help="print the number of occurrences")
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        build_index(args.file, args.index, args.k, args.file_has_3dot, args.packed)
+        return
+
+    idx = PiIndex(args.index)
+    for pattern in args.pattern:
+        t0 = time.perf_counter()
+        if args.count:
+            result = f"count = {idx.count(pattern):,}"
+        elif args.all:
+            hits = idx.find_all(pattern)
+            result = f"{hits.size:,} hits: " + ", ".join(f"{p:,}" for p in hits[:50]) + \
+                     (" ..." if hits.size > 50 else "")
+        else:
+            first = idx.find_first(pattern)
+            result = "[NOT FOUND]" if first is None else f"first fractional_position = {first:,}"
+        us = (time.perf_counter() - t0) * 1e6
+        print(f"{pattern}: {result}  ({us:.0f} us)")
+
+
+if __name__ == "__main__":
+    main()
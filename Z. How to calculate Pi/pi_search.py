@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
-Stream-search a digit pattern (<=6 digits) inside a saved pi digits file.
+Stream-search a digit pattern inside a saved pi digits file.
+
+For many lookups, build an index once with pi_index.py and pass --index:
+queries then take microseconds instead of a full file scan.
 
 Indexing convention (default):
 - If the file contains ONLY fractional digits:
@@ -11,6 +14,7 @@ Indexing convention (default):
 Usage:
   python pi_search.py --file pi_1e6.txt --pattern 040106
   python pi_search.py --file pi_1e6_with3.txt --pattern 040106 --file_has_3dot
+  python pi_search.py --index pi_1e6.idx --pattern 040106
 """
 
 import argparse
@@ -45,8 +49,9 @@ def stream_find_first(path: str, pattern: str, chunk_size: int = 1024 * 1024):
 
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--file", required=True, help="pi digits file")
-    ap.add_argument("--pattern", required=True, help="digit pattern (<=6 digits)")
+    ap.add_argument("--file", help="pi digits file")
+    ap.add_argument("--index", help="index directory built by pi_index.py (instead of --file)")
+    ap.add_argument("--pattern", required=True, help="digit pattern")
     ap.add_argument("--chunk", type=int, default=1024 * 1024, help="chunk size (default 1MB)")
     ap.add_argument("--file_has_3dot", action="store_true",
                     help='Set if file begins with "3." so output position refers to fractional digits')
@@ -55,8 +60,19 @@ def main():
     pattern = args.pattern.strip()
     if not pattern.isdigit():
         raise SystemExit("pattern must be digits only.")
-    if len(pattern) == 0 or len(pattern) > 6:
-        raise SystemExit("pattern length must be 1..6")
+    if len(pattern) == 0:
+        raise SystemExit("pattern must not be empty.")
+    if args.index is None and args.file is None:
+        raise SystemExit("give --file or --index.")
+
+    if args.index is not None:
+        from pi_index import PiIndex
+        found = PiIndex(args.index).find_first(pattern)
+        if found is None:
+            print("[NOT FOUND] within file range.")
+        else:
+            print(f"[FOUND] fractional_position = {found:,} (1-indexed after decimal point)")
+        return
 
     found0 = stream_find_first(args.file, pattern, args.chunk)
     if found0 is None:
@@ -1,3 +1,5 @@
+import functools
+
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -6,7 +8,7 @@ ME_C2_KEV = 511.0  # electron rest energy in keV
 
 def mu_photo(E_keV, mu_photo_ref, E_ref_keV, power=3.0):
     """Simple model: photoelectric μ roughly decreases steeply with energy."""
-    E = max(E_keV, 1e-6)
+    E = np.maximum(E_keV, 1e-6)
     return mu_photo_ref * (E / E_ref_keV) ** (-power)
 
 
@@ -16,6 +18,28 @@ def mu_compton(E_keV, mu_compton_ref):
     return mu_compton_ref
 
 
+class PowerLawMaterial:
+    """
+    Material with the analytic model above. Like every material here,
+    calling it with an energy (keV, scalar or array) returns
+    (mu_photo, mu_compton) in 1/cm; attenuation_tables.TabulatedMaterial
+    is the tabulated counterpart.
+    """
+
+    def __init__(self, mu_photo_ref, mu_compton_ref, E_ref_keV=662.0, photo_power=3.0):
+        self.mu_photo_ref = mu_photo_ref
+        self.mu_compton_ref = mu_compton_ref
+        self.E_ref_keV = E_ref_keV
+        self.photo_power = photo_power
+
+    def __call__(self, E_keV):
+        mu_p = mu_photo(E_keV, self.mu_photo_ref, self.E_ref_keV, self.photo_power)
+        mu_c = mu_compton(E_keV, self.mu_compton_ref)
+        if np.ndim(E_keV):
+            mu_c = np.full(np.shape(E_keV), float(mu_c))
+        return mu_p, mu_c
+
+
 def klein_nishina_pdf_cos_theta(cos_theta, E_keV):
     """
     Klein–Nishina differential cross-section (shape only) as a function of cosθ.
@@ -39,6 +63,7 @@ def sample_cos_theta_kn(E_keV, rng, n_try_max=10_000):
     For the acceptance test we need a bound on pdf.
     A simple bound is to scan a small grid once per call and use its max.
     That's not fastest but is stable and clear for a student project.
+    The transport uses sample_cos_theta_kn_table; this is kept as the reference.
     """
     # Estimate max on a coarse grid
     grid = np.linspace(-1.0, 1.0, 200)
@@ -57,11 +82,203 @@ def sample_cos_theta_kn(E_keV, rng, n_try_max=10_000):
     return 1.0
 
 
+# Inverse-CDF tables for cosθ on a log-spaced energy grid (32 bins per decade)
+KN_E_MIN_KEV, KN_E_MAX_KEV = 1.0, 1.0e4
+KN_N_ENERGY = 129
+KN_N_QUANTILE = 2049
+_KN_LOG_E = np.linspace(np.log(KN_E_MIN_KEV), np.log(KN_E_MAX_KEV), KN_N_ENERGY)
+
+
+@functools.lru_cache(maxsize=KN_N_ENERGY)
+def kn_quantile_table(bin_index):
+    """
+    Quantile function cosθ(u) of the Klein–Nishina shape at grid energy
+    bin_index, tabulated at KN_N_QUANTILE equally spaced u in [0, 1].
+
+    The CDF is integrated on a fine cosθ grid (trapezoid rule) and inverted
+    once; the result is cached per energy bin.
+    """
+    k = np.exp(_KN_LOG_E[bin_index]) / ME_C2_KEV
+    c = np.linspace(-1.0, 1.0, 8 * KN_N_QUANTILE)
+    r = 1.0 / (1.0 + k * (1.0 - c))
+    pdf = r**2 * (r + 1.0 / r - (1.0 - c**2))
+    cdf = np.concatenate(([0.0], np.cumsum(0.5 * (pdf[1:] + pdf[:-1]) * np.diff(c))))
+    table = np.interp(np.linspace(0.0, 1.0, KN_N_QUANTILE), cdf / cdf[-1], c)
+    table.flags.writeable = False  # shared through the cache
+    return table
+
+
+def sample_cos_theta_kn_table(E_keV, rng):
+    """
+    Draw cosθ for a scalar or an array of energies without rejection.
+
+    u ~ U(0, 1) is looked up in the quantile tables of the two grid energies
+    around E (linear in u), and the two values are blended linearly in log E.
+    Energies outside [KN_E_MIN_KEV, KN_E_MAX_KEV] use the edge tables.
+    """
+    E = np.asarray(E_keV, dtype=float)
+    if E.size == 0:
+        return np.empty(E.shape)
+    t = (np.log(np.clip(E, KN_E_MIN_KEV, KN_E_MAX_KEV)) - _KN_LOG_E[0]) / (_KN_LOG_E[1] - _KN_LOG_E[0])
+    i = np.minimum(t.astype(int), KN_N_ENERGY - 2)
+    w = t - i
+
+    used = np.unique(i)
+    tables = np.stack([np.stack([kn_quantile_table(b), kn_quantile_table(b + 1)]) for b in used])
+    row = np.searchsorted(used, i)
+
+    u = rng.random(E.shape) * (KN_N_QUANTILE - 1)
+    j = np.minimum(u.astype(int), KN_N_QUANTILE - 2)
+    f = u - j
+    lo = tables[row, 0, j] * (1.0 - f) + tables[row, 0, j + 1] * f
+    hi = tables[row, 1, j] * (1.0 - f) + tables[row, 1, j + 1] * f
+    cos_th = lo * (1.0 - w) + hi * w
+    return float(cos_th) if cos_th.ndim == 0 else cos_th
+
+
 def compton_scattered_energy(E_keV, cos_theta):
     """Compton formula: E' = E / (1 + (E/mc^2)(1 - cosθ))."""
     k = E_keV / ME_C2_KEV
     return E_keV / (1.0 + k * (1.0 - cos_theta))
 
+def track_photon_event(
+    E0_keV, thickness_cm, material, energy_loss, rng, density_profile=None, density_max=1.0
+):
+    """
+    Event-driven (free-flight) transport of one photon through the slab.
+
+    Instead of stepping by dx, the distance to the next interaction is drawn
+    from the exponential distribution, s = -ln(u) / mu_t, so the cost is
+    proportional to the number of interactions.
+
+    If density_profile(x) is given (relative density, <= density_max), mu
+    varies along the path and Woodcock delta-tracking is used: flights are
+    sampled with the majorant mu_t * density_max and a collision is real
+    with probability density_profile(x) / density_max, otherwise virtual.
+
+    material(E) gives (mu_photo, mu_compton), e.g. a PowerLawMaterial.
+
+    Returns the absorption depth (cm), or np.inf if the photon is transmitted.
+    """
+    x = 0.0
+    E = E0_keV
+
+    while True:
+        mu_p, mu_c = material(E)
+        mu_t = mu_p + mu_c
+        mu_flight = mu_t * (density_max if density_profile is not None else 1.0)
+
+        x += -np.log(1.0 - rng.random()) / mu_flight
+        if x >= thickness_cm:
+            return np.inf  # transmitted
+
+        if density_profile is not None and rng.random() * density_max > density_profile(x):
+            continue  # virtual collision: nothing happens
+
+        if rng.random() < (mu_p / mu_t):
+            return x  # photoelectric absorption
+        if energy_loss:
+            cos_th = sample_cos_theta_kn_table(E, rng)
+            E = compton_scattered_energy(E, cos_th)
+        # In 1D model, photon continues forward after scattering
+
+def transport_vectorized(
+    N, E0_keV, thickness_cm, material, energy_loss, rng, density_profile=None,
+    density_max=1.0, compact_below=0.5
+):
+    """
+    Event-driven transport of all N photons at once (structure of arrays).
+
+    Position, energy and original index of every photon are kept in NumPy
+    arrays together with an alive mask. Each iteration moves every live
+    photon to its next collision, so the loop runs about as many times as
+    the largest number of collisions of any photon, not N times.
+    Dead photons are compacted out of the arrays once fewer than
+    compact_below of the entries are alive, so late iterations only touch
+    the few photons still in flight.
+
+    material(E) must accept an array of energies (PowerLawMaterial or
+    attenuation_tables.TabulatedMaterial); density_profile, if given, an
+    array of depths.
+
+    Returns the absorption depth of every photon (np.inf if transmitted).
+    """
+    absorb_depth = np.full(N, np.inf, dtype=float)
+    idx = np.arange(N)
+    x = np.zeros(N)
+    E = np.full(N, float(E0_keV))
+    alive = np.ones(N, dtype=bool)
+    n_alive = N
+
+    while n_alive:
+        mu_p, mu_c = material(E)
+        mu_t = mu_p + mu_c
+        mu_flight = mu_t * (density_max if density_profile is not None else 1.0)
+
+        x += -np.log(1.0 - rng.random(x.size)) / mu_flight
+        alive &= x < thickness_cm  # transmitted photons leave the population
+
+        collide = alive.copy()
+        if density_profile is not None:
+            # Woodcock: virtual collisions leave the photon unchanged
+            collide &= rng.random(x.size) * density_max <= density_profile(x)
+
+        photo = collide & (rng.random(x.size) < mu_p / mu_t)
+        absorb_depth[idx[photo]] = x[photo]
+        alive &= ~photo
+
+        if energy_loss:
+            scatter = collide & ~photo
+            E[scatter] = compton_scattered_energy(E[scatter], sample_cos_theta_kn_table(E[scatter], rng))
+        # In 1D model, photon continues forward after scattering
+
+        n_alive = int(alive.sum())
+        if n_alive < compact_below * alive.size:
+            idx, x, E = idx[alive], x[alive], E[alive]
+            alive = np.ones(n_alive, dtype=bool)
+
+    return absorb_depth
+
+class DepthTally:
+    """
+    Histogram of absorption depths on a thickness grid, giving I(x)/I0.
+
+    Each photon is binned once with searchsorted: bin k counts photons with
+    grid[k-1] < depth <= grid[k], and bin len(grid) the transmitted ones.
+    The number surviving past grid[k] is then a reverse cumulative sum,
+    O(N log grid + grid) instead of one pass over all photons per grid point.
+
+    Tallies on the same grid can be merged, so batches and worker processes
+    can each fill their own and combine them at the end.
+    """
+
+    def __init__(self, thickness_grid):
+        self.grid = np.asarray(thickness_grid, dtype=float)
+        self.counts = np.zeros(self.grid.size + 1, dtype=np.int64)
+
+    @property
+    def n(self):
+        return int(self.counts.sum())
+
+    def add(self, absorb_depth):
+        """Add photons by absorption depth (np.inf for transmitted)."""
+        bins = np.searchsorted(self.grid, absorb_depth, side="left")
+        self.counts += np.bincount(bins, minlength=self.counts.size)
+        return self
+
+    def merge(self, other):
+        """Combine with a tally on the same grid."""
+        if not np.array_equal(self.grid, other.grid):
+            raise ValueError("Can only merge tallies on the same thickness grid.")
+        self.counts += other.counts
+        return self
+
+    def intensity(self):
+        """I(x)/I0 on the grid: photons with absorption depth > x, over I at grid[0]."""
+        surviving = np.cumsum(self.counts[::-1])[::-1][1:]
+        return surviving / max(surviving[0], 1)
+
+
 # Monte Carlo simulation
 def simulate_photons(
     N=1000,
@@ -73,9 +290,30 @@ def simulate_photons(
     E_ref_keV=662.0,
     photo_power=3.0,
     energy_loss=True,
-    seed=42
+    seed=42,
+    mode="step",
+    density_profile=None,
+    density_max=1.0,
+    material=None
 ):
     """
+    mode:
+      "step"  : fixed dx steps, one interaction test per step (the stepping
+                scheme of the first version)
+      "event" : free-flight sampling between interactions (track_photon_event),
+                cost independent of dx
+      "vector": free-flight sampling for all photons at once (transport_vectorized),
+                same physics as "event", for very large N
+      In every mode the Compton angle comes from the Klein–Nishina tables
+      (sample_cos_theta_kn_table), not the rejection sampler. The random
+      stream differs, so mode="step" with seed=42 does not reproduce the
+      numbers of the first version exactly, only within statistical error.
+    density_profile: optional relative density rho(x) <= density_max that
+      scales mu along the slab (Woodcock delta-tracking in event mode)
+    material: optional mu(E) -> (mu_photo, mu_compton), e.g. a TabulatedMaterial
+      from attenuation_tables.py; replaces the analytic model given by
+      mu_photo_ref, mu_compton_ref, E_ref_keV and photo_power
+
     Returns:
       thickness_grid (cm),
       I_over_I0 (array),
@@ -92,54 +330,71 @@ def simulate_photons(
     steps = int(np.ceil(thickness_cm / dx_cm))
     thickness_grid = np.linspace(0.0, thickness_cm, steps + 1)
 
+    if material is None:
+        material = PowerLawMaterial(mu_photo_ref, mu_compton_ref, E_ref_keV, photo_power)
+
     # Reference μ at E0 (for theory HVL comparison)
-    mu_ref_total = mu_photo(E0_keV, mu_photo_ref, E_ref_keV, photo_power) + mu_compton(E0_keV, mu_compton_ref)
-
-    for n in range(N):
-        x = 0.0
-        E = E0_keV
-        alive = True
-
-        for _ in range(steps):
-            if not alive:
-                break
-
-            # Current macroscopic coefficients
-            mu_p = mu_photo(E, mu_photo_ref, E_ref_keV, photo_power)
-            mu_c = mu_compton(E, mu_compton_ref)
-            mu_t = mu_p + mu_c
-
-            # Probability at least one interaction in dx (Poisson)
-            p_int = 1.0 - np.exp(-mu_t * dx_cm)
-
-            r = rng.random()
-            if r < p_int:
-                # An interaction occurs, choose type by relative rates
-                if rng.random() < (mu_p / mu_t):
-                    # Photoelectric absorption (photon dies here)
-                    alive = False
-                    absorb_depth[n] = x  # absorbed at current depth
+    mu_ref_total = float(sum(material(E0_keV)))
+
+    if mode not in ("step", "event", "vector"):
+        raise ValueError(f"mode must be 'step', 'event' or 'vector', got {mode!r}")
+
+    if mode == "vector":
+        absorb_depth = transport_vectorized(
+            N, E0_keV, thickness_cm, material, energy_loss, rng, density_profile, density_max
+        )
+    else:
+        for n in range(N):
+            if mode == "event":
+                absorb_depth[n] = track_photon_event(
+                    E0_keV, thickness_cm, material, energy_loss, rng,
+                    density_profile, density_max
+                )
+                continue
+
+            x = 0.0
+            E = E0_keV
+            alive = True
+
+            for _ in range(steps):
+                if not alive:
+                    break
+
+                # Current macroscopic coefficients
+                mu_p, mu_c = material(E)
+                mu_t = mu_p + mu_c
+                rho = density_profile(x) if density_profile is not None else 1.0
+
+                # Probability at least one interaction in dx (Poisson)
+                p_int = 1.0 - np.exp(-mu_t * rho * dx_cm)
+
+                r = rng.random()
+                if r < p_int:
+                    # An interaction occurs, choose type by relative rates
+                    if rng.random() < (mu_p / mu_t):
+                        # Photoelectric absorption (photon dies here)
+                        alive = False
+                        absorb_depth[n] = x  # absorbed at current depth
+                    else:
+                        # Compton scatter: update energy if enabled
+                        if energy_loss:
+                            cos_th = sample_cos_theta_kn_table(E, rng)
+                            E = compton_scattered_energy(E, cos_th)
+                            # Optional: if energy becomes too low, absorption dominates anyway
+                            E = max(E, 1e-3)
+                        # In 1D model, photon continues forward after scattering
+                        x += dx_cm
                 else:
-                    # Compton scatter: update energy if enabled
-                    if energy_loss:
-                        cos_th = sample_cos_theta_kn(E, rng)
-                        E = compton_scattered_energy(E, cos_th)
-                        # Optional: if energy becomes too low, absorption dominates anyway
-                        E = max(E, 1e-3)
-                    # In 1D model, photon continues forward after scattering
+                    # No interaction
                     x += dx_cm
-            else:
-                # No interaction
-                x += dx_cm
 
-            if x >= thickness_cm - 1e-12:
-                break
+                if x >= thickness_cm - 1e-12:
+                    break
 
-        # If alive until exiting the slab, absorb_depth remains np.inf
+            # If alive until exiting the slab, absorb_depth remains np.inf
 
-    # Intensity at thickness x is count of photons with absorb_depth > x
-    I = np.array([(absorb_depth > x).sum() for x in thickness_grid], dtype=float)
-    I_over_I0 = I / I[0]
+    # Intensity at thickness x is the fraction of photons with absorb_depth > x
+    I_over_I0 = DepthTally(thickness_grid).add(absorb_depth).intensity()
 
     transmitted_mask = np.isinf(absorb_depth)
     absorbed_depths = absorb_depth[~transmitted_mask]
@@ -187,10 +442,12 @@ def main():
         mu_c_ref = float(input("mu_compton_ref at E0 (e.g., 0.10): ").strip() or "0.10")
 
         power = float(input("Photoelectric energy power (mu_photo ~ E^{-p}), p (e.g., 3): ").strip() or "3")
+        mode = input("Transport mode, vector, event or step (e.g., vector): ").strip() or "vector"
     except ValueError:
         print("Invalid input. Using defaults.")
         N, E0, thickness, dx = 1000, 662.0, 5.0, 0.01
         mu_p_ref, mu_c_ref, power = 0.40, 0.10, 3.0
+        mode = "vector"
 
     # Run 2 scenarios:
     # 1) Energy loss ON (physically meaningful)
@@ -199,14 +456,14 @@ def main():
         N=N, E0_keV=E0, thickness_cm=thickness, dx_cm=dx,
         mu_photo_ref=mu_p_ref, mu_compton_ref=mu_c_ref,
         E_ref_keV=E0, photo_power=power,
-        energy_loss=True, seed=42
+        energy_loss=True, seed=42, mode=mode
     )
 
     x2, I2, abs_depths2, tx_mask2, _ = simulate_photons(
         N=N, E0_keV=E0, thickness_cm=thickness, dx_cm=dx,
         mu_photo_ref=mu_p_ref, mu_compton_ref=mu_c_ref,
         E_ref_keV=E0, photo_power=power,
-        energy_loss=False, seed=42
+        energy_loss=False, seed=42, mode=mode
     )
 
     # HVL
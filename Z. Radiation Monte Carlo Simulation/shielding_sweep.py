@@ -0,0 +1,188 @@
+"""
+Non-interactive shielding parameter sweep over material, thickness, E0 and mu_ref.
+
+Every scenario is split into photon batches and the (scenario, batch)
+tasks are spread over a process pool. Batch b of scenario s always uses
+child b of child s of np.random.SeedSequence(seed), so the streams are
+independent and the results do not depend on the number of workers.
+Each batch returns a DepthTally. The parent merges them per scenario
+and reports HVL and transmission.
+
+A material is any callable mu(E) -> (mu_photo, mu_compton) in 1/cm, as in
+slab_3d.py: the analytic PowerLawMaterial or a TabulatedMaterial loaded
+from XCOM data with --xcom.
+
+Results are returned as a dict of arrays (one entry per scenario) and can
+be saved to .npz, or to .parquet if pandas + pyarrow are installed.
+
+Usage:
+  python shielding_sweep.py --materials lead concrete --thickness 2 5 10 \\
+      --E0 200 662 1250 --N 1000000 --out shielding.npz
+  python shielding_sweep.py --xcom lead_xcom lead.csv 11.35 --materials lead_xcom
+"""
+
+import argparse
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from attenuation_tables import load_xcom_material
+from radiation_Monte_Carlo import (DepthTally, PowerLawMaterial, find_hvl,
+                                   transport_vectorized)
+
+Scenario = namedtuple("Scenario", ["material", "thickness_cm", "E0_keV", "mu_scale"])
+
+# Rough placeholders (1/cm at 662 keV), matching the defaults of the 1D model
+MATERIALS = {
+    "lead": PowerLawMaterial(mu_photo_ref=0.40, mu_compton_ref=0.10),
+    "concrete": PowerLawMaterial(mu_photo_ref=0.005, mu_compton_ref=0.17),
+}
+
+
+class ScaledMaterial:
+    """material with both coefficients multiplied by scale (picklable, for the pool)."""
+
+    def __init__(self, material, scale):
+        self.material = material
+        self.scale = scale
+
+    def __call__(self, E_keV):
+        mu_p, mu_c = self.material(E_keV)
+        return self.scale * mu_p, self.scale * mu_c
+
+
+def scenario_grid(materials=("lead",), thicknesses=(5.0,), energies=(662.0,), mu_scales=(1.0,)):
+    """All combinations; mu_scales multiplies both coefficients of the material."""
+    return [Scenario(m, float(d), float(E0), float(k))
+            for m in materials for d in thicknesses for E0 in energies for k in mu_scales]
+
+
+def _thickness_grid(sc, dx_cm):
+    steps = int(np.ceil(sc.thickness_cm / dx_cm))
+    return np.linspace(0.0, sc.thickness_cm, steps + 1)
+
+
+def _run_batch(task):
+    """Worker: transport one batch of one scenario, return its DepthTally."""
+    s, sc, material, n, dx_cm, energy_loss, seed_seq = task
+    rng = np.random.default_rng(seed_seq)
+    depth = transport_vectorized(n, sc.E0_keV, sc.thickness_cm, material, energy_loss, rng)
+    return s, DepthTally(_thickness_grid(sc, dx_cm)).add(depth)
+
+
+def shielding_sweep(scenarios, n_photons=1_000_000, batch_size=250_000, dx_cm=0.01,
+                    energy_loss=True, workers=None, seed=None, materials=None):
+    """
+    Run every scenario with n_photons photons, in batches of at most batch_size.
+    Scenario.material is looked up in materials (default MATERIALS), a dict
+    name -> mu(E); the callables must be picklable when workers > 1.
+
+    Returns a dict name -> array over scenarios, with the scenario fields and
+    mu_photo0, mu_compton0 (at E0), hvl_mc, hvl_theory, transmitted, n, plus
+    grid / intensity as (S, G) arrays padded with NaN (the grid length
+    depends on the thickness).
+    """
+    materials = MATERIALS if materials is None else materials
+    mus = [ScaledMaterial(materials[sc.material], sc.mu_scale) for sc in scenarios]
+    n_batches = -(-n_photons // batch_size)
+    sizes = [batch_size] * (n_batches - 1) + [n_photons - (n_batches - 1) * batch_size]
+    streams = [ss.spawn(n_batches) for ss in np.random.SeedSequence(seed).spawn(len(scenarios))]
+    tasks = [(s, sc, mus[s], sizes[b], dx_cm, energy_loss, streams[s][b])
+             for s, sc in enumerate(scenarios) for b in range(n_batches)]
+
+    tallies = [DepthTally(_thickness_grid(sc, dx_cm)) for sc in scenarios]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(_run_batch, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+    else:
+        partials = map(_run_batch, tasks)
+    for s, tally in partials:
+        tallies[s].merge(tally)
+
+    G = max(t.grid.size for t in tallies)
+    results = {name: np.array([getattr(sc, name) for sc in scenarios]) for name in Scenario._fields}
+    results["grid"] = np.full((len(scenarios), G), np.nan)
+    results["intensity"] = np.full((len(scenarios), G), np.nan)
+    mu_photo0, mu_compton0, hvl_mc, hvl_theory, transmitted, n = [], [], [], [], [], []
+    for s, (sc, t) in enumerate(zip(scenarios, tallies)):
+        I = t.intensity()
+        results["grid"][s, :t.grid.size] = t.grid
+        results["intensity"][s, :t.grid.size] = I
+        mu_p, mu_c = (float(mu) for mu in mus[s](sc.E0_keV))
+        mu_photo0.append(mu_p)
+        mu_compton0.append(mu_c)
+        hvl_mc.append(find_hvl(t.grid, I))
+        hvl_theory.append(np.log(2.0) / (mu_p + mu_c))
+        transmitted.append(t.counts[-1] / t.n)
+        n.append(t.n)
+    results.update(mu_photo0=np.array(mu_photo0), mu_compton0=np.array(mu_compton0),
+                   hvl_mc=np.array(hvl_mc), hvl_theory=np.array(hvl_theory),
+                   transmitted=np.array(transmitted), n=np.array(n))
+    return results
+
+
+def save_results(results, path):
+    """Save to .npz, or to .parquet (one row per scenario, needs pandas + pyarrow)."""
+    if path.endswith(".parquet"):
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("Saving to .parquet needs pandas and pyarrow; use a .npz path instead.")
+        table = {k: v for k, v in results.items() if v.ndim == 1}
+        table.update({k: list(results[k]) for k in ("grid", "intensity")})
+        pd.DataFrame(table).to_parquet(path)
+    else:
+        np.savez(path, **results)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--materials", nargs="+", default=["lead"],
+                    help=f"names from {sorted(MATERIALS)} or added with --xcom")
+    ap.add_argument("--xcom", nargs=3, action="append", default=[],
+                    metavar=("NAME", "CSV", "DENSITY"),
+                    help="add a material from an XCOM CSV file (density in g/cm^3)")
+    ap.add_argument("--thickness", nargs="+", type=float, default=[5.0], help="cm")
+    ap.add_argument("--E0", nargs="+", type=float, default=[662.0], help="keV")
+    ap.add_argument("--mu_scale", nargs="+", type=float, default=[1.0],
+                    help="factors applied to the material's mu_ref")
+    ap.add_argument("--N", type=int, default=1_000_000, help="photons per scenario")
+    ap.add_argument("--batch_size", type=int, default=250_000)
+    ap.add_argument("--dx", type=float, default=0.01, help="tally grid spacing in cm")
+    ap.add_argument("--no_energy_loss", action="store_true")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--out", default="shielding_sweep.npz", help=".npz or .parquet")
+    args = ap.parse_args()
+
+    materials = dict(MATERIALS)
+    for name, path, density in args.xcom:
+        materials[name] = load_xcom_material(path, float(density), name=name)
+    unknown = sorted(set(args.materials) - set(materials))
+    if unknown:
+        ap.error(f"unknown material(s) {unknown}; choose from {sorted(materials)}")
+
+    scenarios = scenario_grid(args.materials, args.thickness, args.E0, args.mu_scale)
+    t0 = time.time()
+    res = shielding_sweep(scenarios, args.N, args.batch_size, args.dx,
+                          not args.no_energy_loss, args.workers, args.seed, materials)
+    print(f"[OK] {len(scenarios)} scenarios x {res['n'][0]:,} photons, "
+          f"time={time.time() - t0:.1f}s\n")
+
+    print(f"{'material':<10}{'d (cm)':>8}{'E0 (keV)':>10}{'mu_p0':>8}{'mu_c0':>8}"
+          f"{'HVL MC':>9}{'HVL ln2/mu':>12}{'transmitted':>13}")
+    for s in range(len(scenarios)):
+        print(f"{res['material'][s]:<10}{res['thickness_cm'][s]:>8g}{res['E0_keV'][s]:>10g}"
+              f"{res['mu_photo0'][s]:>8.3g}{res['mu_compton0'][s]:>8.3g}"
+              f"{res['hvl_mc'][s]:>9.4f}{res['hvl_theory'][s]:>12.4f}{res['transmitted'][s]:>13.5f}")
+
+    save_results(res, args.out)
+    print(f"\nSaved results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
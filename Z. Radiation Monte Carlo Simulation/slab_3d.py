@@ -0,0 +1,190 @@
+"""
+3D photon transport through a stack of material layers (e.g. lead + concrete).
+
+radiation_Monte_Carlo.py is 1D: after a Compton scatter the photon simply
+continues forward. Here every photon carries direction cosines (u, v, w),
+w being the cosine to the slab normal z, and scatters into a new direction
+with the Klein–Nishina angle and a uniform azimuth. This means backscatter
+and angular spread are included.
+
+The layers are infinite in x and y and stacked along z. Each layer has
+its own material, mu(E) -> (mu_photo, mu_compton): the analytic power-law
+model or a TabulatedMaterial from XCOM data (attenuation_tables.py).
+Flights are sampled with Woodcock delta-tracking against the largest mu_t
+of all layers at the photon's energy, so layer boundaries need no special
+treatment. A collision in a layer with smaller mu_t is real with
+probability mu_t(layer) / mu_max.
+
+Tallies: transmitted and reflected photons (count and energy), uncollided
+transmission, and energy deposited per layer (photoelectric absorption,
+Compton recoil electrons, photons below the energy cutoff).
+
+Usage:
+  python slab_3d.py --N 1000000 --lead 2 --concrete 10
+  python slab_3d.py --lead_xcom lead.csv --concrete_xcom concrete.csv
+"""
+
+import argparse
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from attenuation_tables import load_xcom_material
+from radiation_Monte_Carlo import (PowerLawMaterial, compton_scattered_energy,
+                                   sample_cos_theta_kn_table)
+
+Layer = namedtuple("Layer", ["name", "thickness_cm", "material"])
+
+SlabTally = namedtuple("SlabTally", [
+    "n",                  # photons simulated
+    "transmitted",        # photons leaving through the back face
+    "uncollided",         # ... of which never interacted
+    "reflected",          # photons leaving through the front face
+    "absorbed",           # photons absorbed, per layer (array)
+    "E_transmitted_keV",  # energy carried out through the back face
+    "E_reflected_keV",    # energy carried out through the front face
+    "E_deposited_keV",    # energy deposited, per layer (array)
+])
+
+
+# Rough placeholders at 662 keV (1/cm), same spirit as the 1D defaults
+LEAD = PowerLawMaterial(mu_photo_ref=0.40, mu_compton_ref=0.10)
+CONCRETE = PowerLawMaterial(mu_photo_ref=0.005, mu_compton_ref=0.17)
+
+
+def rotate_directions(u, v, w, cos_th, phi):
+    """New direction cosines after scattering by polar angle θ and azimuth φ."""
+    sin_th = np.sqrt(np.maximum(1.0 - cos_th**2, 0.0))
+    cos_ph, sin_ph = np.cos(phi), np.sin(phi)
+    perp = np.sqrt(np.maximum(1.0 - w**2, 0.0))
+    along_z = perp < 1e-8
+    safe = np.where(along_z, 1.0, perp)
+
+    u_new = np.where(along_z, sin_th * cos_ph,
+                     sin_th * (u * w * cos_ph - v * sin_ph) / safe + u * cos_th)
+    v_new = np.where(along_z, sin_th * sin_ph,
+                     sin_th * (v * w * cos_ph + u * sin_ph) / safe + v * cos_th)
+    w_new = np.where(along_z, np.sign(w) * cos_th, -sin_th * cos_ph * perp + w * cos_th)
+    return u_new, v_new, w_new
+
+
+def simulate_slab_3d(layers, N=100_000, E0_keV=662.0, cos_incident=1.0, E_cut_keV=1.0,
+                     seed=42, compact_below=0.5):
+    """
+    Transport N photons (pencil beam, entering at z = 0 with w = cos_incident)
+    through the layer stack. All photons are advanced together, as in
+    transport_vectorized, and dead photons are compacted out periodically.
+
+    Returns:
+      SlabTally
+    """
+    rng = np.random.default_rng(seed)
+    n_layers = len(layers)
+    edges = np.concatenate(([0.0], np.cumsum([l.thickness_cm for l in layers])))
+    depth = edges[-1]
+
+    z = np.zeros(N)
+    E = np.full(N, float(E0_keV))
+    u = np.full(N, np.sqrt(1.0 - cos_incident**2))
+    v = np.zeros(N)
+    w = np.full(N, float(cos_incident))
+    collided = np.zeros(N, dtype=bool)
+    alive = np.ones(N, dtype=bool)
+    n_alive = N
+
+    transmitted = uncollided = reflected = 0
+    E_tx = E_refl = 0.0
+    absorbed = np.zeros(n_layers, dtype=np.int64)
+    deposited = np.zeros(n_layers)
+
+    while n_alive:
+        # majorant over layers at the current energies
+        mus = [l.material(E) for l in layers]
+        mu_tot = np.stack([mp + mc for mp, mc in mus])
+        mu_max = mu_tot.max(axis=0)
+
+        z += w * -np.log(1.0 - rng.random(z.size)) / mu_max
+
+        out_back = alive & (z >= depth)
+        out_front = alive & (z < 0.0)
+        transmitted += int(out_back.sum())
+        uncollided += int((out_back & ~collided).sum())
+        reflected += int(out_front.sum())
+        E_tx += E[out_back].sum()
+        E_refl += E[out_front].sum()
+        alive &= ~(out_back | out_front)
+
+        layer = np.clip(np.searchsorted(edges, z, side="right") - 1, 0, n_layers - 1)
+        rows = np.arange(z.size)
+        mu_p_here = np.stack([mp for mp, _ in mus])[layer, rows]
+        mu_t_here = mu_tot[layer, rows]
+
+        # Woodcock: real collision with probability mu_t(layer) / mu_max
+        real = alive & (rng.random(z.size) * mu_max < mu_t_here)
+        collided |= real
+
+        photo = real & (rng.random(z.size) < mu_p_here / mu_t_here)
+        absorbed += np.bincount(layer[photo], minlength=n_layers)
+        deposited += np.bincount(layer[photo], weights=E[photo], minlength=n_layers)
+        alive &= ~photo
+
+        scatter = real & ~photo
+        if scatter.any():
+            cos_th = sample_cos_theta_kn_table(E[scatter], rng)
+            E_new = compton_scattered_energy(E[scatter], cos_th)
+            deposited += np.bincount(layer[scatter], weights=E[scatter] - E_new,
+                                     minlength=n_layers)
+            E[scatter] = E_new
+            u[scatter], v[scatter], w[scatter] = rotate_directions(
+                u[scatter], v[scatter], w[scatter], cos_th,
+                rng.uniform(0.0, 2.0 * np.pi, cos_th.size))
+
+            # photons below the cutoff deposit their energy locally
+            low = scatter & (E < E_cut_keV)
+            deposited += np.bincount(layer[low], weights=E[low], minlength=n_layers)
+            absorbed += np.bincount(layer[low], minlength=n_layers)
+            alive &= ~low
+
+        n_alive = int(alive.sum())
+        if n_alive < compact_below * alive.size:
+            z, E, u, v, w, collided = (a[alive] for a in (z, E, u, v, w, collided))
+            alive = np.ones(n_alive, dtype=bool)
+
+    return SlabTally(N, transmitted, uncollided, reflected, absorbed, E_tx, E_refl, deposited)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--N", type=int, default=1_000_000)
+    ap.add_argument("--E0", type=float, default=662.0, help="photon energy in keV")
+    ap.add_argument("--lead", type=float, default=2.0, help="lead thickness in cm")
+    ap.add_argument("--concrete", type=float, default=10.0, help="concrete thickness in cm")
+    ap.add_argument("--lead_xcom", help="XCOM CSV for lead (default: analytic placeholder)")
+    ap.add_argument("--concrete_xcom", help="XCOM CSV for concrete (default: analytic placeholder)")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    lead = load_xcom_material(args.lead_xcom, 11.35) if args.lead_xcom else LEAD
+    concrete = load_xcom_material(args.concrete_xcom, 2.3) if args.concrete_xcom else CONCRETE
+    layers = [Layer("lead", args.lead, lead), Layer("concrete", args.concrete, concrete)]
+    t0 = time.time()
+    tally = simulate_slab_3d(layers, N=args.N, E0_keV=args.E0, seed=args.seed)
+    elapsed = time.time() - t0
+
+    N, E_in = tally.n, tally.n * args.E0
+    print(f"\n=== 3D slab: {' + '.join(f'{l.thickness_cm:g} cm {l.name}' for l in layers)} ===")
+    print(f"N = {N:,} photons at {args.E0:g} keV, time = {elapsed:.2f}s\n")
+    print(f"Transmitted fraction:   {tally.transmitted / N:.5f}  "
+          f"(uncollided {tally.uncollided / N:.5f})")
+    print(f"Reflected fraction:     {tally.reflected / N:.5f}")
+    print(f"Transmitted energy:     {tally.E_transmitted_keV / E_in:.5f} of incident")
+    print(f"Reflected energy:       {tally.E_reflected_keV / E_in:.5f} of incident")
+    for l, n_abs, dep in zip(layers, tally.absorbed, tally.E_deposited_keV):
+        print(f"Deposited in {l.name:<10} {dep / E_in:.5f} of incident ({n_abs / N:.5f} absorbed)")
+    balance = (tally.E_transmitted_keV + tally.E_reflected_keV + tally.E_deposited_keV.sum()) / E_in
+    print(f"Energy balance:         {balance:.6f}")
+
+
+if __name__ == "__main__":
+    main()
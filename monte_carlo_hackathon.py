@@ -1,8 +1,15 @@
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 from scipy.integrate import dblquad
 
+# qmc_integrate lives in "Probability (Monte Carlo)/mc_integrate.py"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Probability (Monte Carlo)"))
+from mc_integrate import qmc_integrate
+
 # 1) Define Integrand
 # f_A(x, y) = cos(pi x/2) * cos(pi y/2)
 # Domain: (x, y) in [0,1] x [0,1]
@@ -21,6 +28,9 @@ exact_result, exact_err_est = dblquad(
     lambda x: y_max
 )
 
+# Analytic value: (int_0^1 cos(pi x/2) dx)^2 = (2/pi)^2
+analytic_result = 4.0 / np.pi**2
+
 # 2) Monte Carlo Integration
 N = 10000  # Number of random samples
 
@@ -43,12 +53,21 @@ monte_carlo_result = z_values.mean() * domain_area
 # SE(I) = area * std(f) / sqrt(N)
 monte_carlo_error = domain_area * np.std(z_values, ddof=1) / np.sqrt(N)
 
+# 3) Quasi-Monte Carlo Integration (scrambled Sobol, error ~ 1/N)
+# 16 independent scramblings of 2^10 points each; their spread gives an
+# honest error bar. N_qmc is the total number of points actually used.
+qmc_result, qmc_error, N_qmc, _ = qmc_integrate(
+    f, [(x_min, x_max), (y_min, y_max)], n=2**10, method="sobol", n_replicas=16, seed=2026
+)
+
 # Print results
 print(f"--- Results (Group A) ---")
 print(f"Exact Result (dblquad):      {exact_result:.8f}  (quad err est ~ {exact_err_est:.2e})")
 print(f"Analytic Result (4/pi^2):    {analytic_result:.8f}")
 print(f"Monte Carlo Result:          {monte_carlo_result:.8f} ± {monte_carlo_error:.8f} (1σ)")
 print(f"Absolute error vs dblquad:   {abs(monte_carlo_result - exact_result):.8f}")
+print(f"Quasi-MC (Sobol) Result:     {qmc_result:.8f} ± {qmc_error:.8f} (1σ, N={N_qmc})")
+print(f"QMC absolute error:          {abs(qmc_result - analytic_result):.8f}")
 
 # Grid for smooth surface plot
 x_grid = np.linspace(x_min, x_max, 80)
@@ -67,7 +86,8 @@ surf = ax.plot_surface(X, Y, Z, cmap='viridis', edgecolor='none', alpha=0.85)
 result_text = (
     f"Exact (dblquad): {exact_result:.6f}\n"
     f"Analytic 4/pi^2: {analytic_result:.6f}\n"
-    f"MC (N={N}): {monte_carlo_result:.6f} ± {monte_carlo_error:.6f}"
+    f"MC (N={N}): {monte_carlo_result:.6f} ± {monte_carlo_error:.6f}\n"
+    f"QMC (N={N_qmc}): {qmc_result:.8f} ± {qmc_error:.8f}"
 )
 ax.text2D(
     0.05, 0.95, result_text,
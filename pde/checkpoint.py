@@ -0,0 +1,91 @@
+"""
+Checkpoint/restart for long PDE time integrations.
+
+The solver state (arrays + step counter + time) is written with np.savez to
+a temporary file next to the target, flushed to disk, then moved over the
+old checkpoint with os.replace. The rename is atomic, so an interrupted write
+never leaves a half-written checkpoint behind. Arrays are stored raw (no
+compression, no text), so a resumed run continues bit-for-bit.
+
+Usage (inside a time loop):
+  ckpt = CheckpointManager("run.npz", every=500)
+  saved = ckpt.load()
+  if saved is not None:
+      step, t, arrays = saved
+      u = arrays["u"]
+  ...
+  ckpt.maybe_save(step, t, u=u)
+"""
+
+import os
+import time
+
+import numpy as np
+
+
+class CheckpointManager:
+    """
+    Periodically save solver state to `path` and restore it on restart.
+
+    every         : save every `every` steps (None to disable)
+    every_seconds : also save if this many wall-clock seconds have passed
+                    since the last save (None to disable)
+    """
+
+    def __init__(self, path, every=1000, every_seconds=None):
+        if every is None and every_seconds is None:
+            raise ValueError("Set at least one of every / every_seconds.")
+        self.path = str(path)
+        self.every = every
+        self.every_seconds = every_seconds
+        self._last_save = time.monotonic()
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def due(self, step):
+        """True if a checkpoint should be written after `step`."""
+        if self.every is not None and step % self.every == 0:
+            return True
+        if self.every_seconds is not None:
+            return time.monotonic() - self._last_save >= self.every_seconds
+        return False
+
+    def save(self, step, t, **arrays):
+        """Write the state atomically: temp file -> fsync -> os.replace."""
+        for key in ("_step", "_t"):
+            if key in arrays:
+                raise ValueError(f"'{key}' is reserved for checkpoint metadata.")
+
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, _step=np.int64(step), _t=np.float64(t), **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._last_save = time.monotonic()
+
+    def maybe_save(self, step, t, **arrays):
+        """Save if the cadence says so. Returns True if a checkpoint was written."""
+        if self.due(step):
+            self.save(step, t, **arrays)
+            return True
+        return False
+
+    def load(self):
+        """
+        Returns (step, t, arrays) from the last checkpoint, or None if there is none.
+        """
+        if not self.exists():
+            return None
+        with np.load(self.path) as data:
+            arrays = {k: data[k] for k in data.files if k not in ("_step", "_t")}
+            step = int(data["_step"])
+            t = float(data["_t"])
+        return step, t, arrays
+
+    def clear(self):
+        """Remove the checkpoint (e.g. after a run finished successfully)."""
+        for p in (self.path, self.path + ".tmp"):
+            if os.path.exists(p):
+                os.remove(p)
@@ -0,0 +1,95 @@
+"""
+Non-interactive 2D diffusion driver with checkpoint/restart.
+
+Same problem as diffusion_2d_correction.py (hot spot at u[30, 20] on a
+100x100 grid, fixed zero boundaries), but the explicit update is vectorized
+and the state lives in local variables that are checkpointed at a fixed
+cadence. Killing the run and starting it again with the same arguments
+continues from the last checkpoint and gives bit-for-bit the same result.
+
+Usage:
+  python diffusion_run.py --steps 100000 --checkpoint diff.npz --every 5000
+  python diffusion_run.py --steps 100000 --checkpoint diff.npz --every_seconds 600
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from checkpoint import CheckpointManager
+
+
+def diffusion_step(u, r):
+    """One explicit (FTCS) step, r = D dt / dx^2 (stable for r <= 1/4)."""
+    u_new = u.copy()
+    u_new[1:-1, 1:-1] += r * (u[2:, 1:-1] + u[:-2, 1:-1] +
+                              u[1:-1, 2:] + u[1:-1, :-2] -
+                              4.0 * u[1:-1, 1:-1])
+    return u_new
+
+
+def run_diffusion(u0, n_steps, r=0.25, dt=1.0, checkpoint=None):
+    """
+    Advance u0 by n_steps explicit steps.
+
+    checkpoint: optional CheckpointManager; resumes from it if present.
+
+    Returns:
+      u after n_steps, final time
+    """
+    if r > 0.25:
+        raise ValueError(f"r = {r} > 1/4: explicit 2D diffusion is unstable.")
+
+    u = u0.copy()
+    step, t = 0, 0.0
+    if checkpoint is not None:
+        saved = checkpoint.load()
+        if saved is not None:
+            step, t, arrays = saved
+            if arrays["u"].shape != u0.shape or float(arrays["r"]) != r:
+                raise ValueError(f"Checkpoint {checkpoint.path} belongs to a different run.")
+            u = arrays["u"]
+            print(f"[RESUME] step={step:,}, t={t:.3f}")
+
+    while step < n_steps:
+        u = diffusion_step(u, r)
+        step += 1
+        t += dt
+        if checkpoint is not None:
+            checkpoint.maybe_save(step, t, u=u, r=np.float64(r))
+
+    return u, t
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--nx", type=int, default=100)
+    ap.add_argument("--ny", type=int, default=100)
+    ap.add_argument("--steps", type=int, default=400)
+    ap.add_argument("--r", type=float, default=0.25, help="D dt / dx^2 (<= 0.25)")
+    ap.add_argument("--checkpoint", type=str, default=None, help="checkpoint file (.npz)")
+    ap.add_argument("--every", type=int, default=1000, help="checkpoint every N steps")
+    ap.add_argument("--every_seconds", type=float, default=None,
+                    help="also checkpoint after this many wall-clock seconds")
+    ap.add_argument("--out", type=str, default="diffusion_final.npy", help="final field")
+    args = ap.parse_args()
+
+    u0 = np.zeros((args.nx, args.ny))
+    u0[30, 20] = 1.0     # initial hot spot
+
+    ckpt = None
+    if args.checkpoint:
+        ckpt = CheckpointManager(args.checkpoint, every=args.every,
+                                 every_seconds=args.every_seconds)
+
+    t0 = time.time()
+    u, t = run_diffusion(u0, args.steps, args.r, checkpoint=ckpt)
+    np.save(args.out, u)
+    print(f"[OK] steps={args.steps:,}, t={t:.1f}, sum(u)={u.sum():.6f}, "
+          f"time={time.time() - t0:.2f}s")
+    print(f"[SAVED] {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Scheme registry for the 1D wave equation  u_tt = c^2 u_xx.
+
+The equation is written as the first-order system used in waveftcs_anim:
+    u_t = c v_x
+    v_t = c u_x
+so every scheme advances the pair (u, v). Each update rule is a vectorized
+kernel registered together with its stability bound (largest allowed Courant
+number lambda = c dt / dx). The runner picks the largest stable dt from that
+bound, so FTCS, Lax, Lax-Wendroff and leapfrog can be compared under one API.
+
+Boundaries are periodic (np.roll), which keeps the Gaussian-pulse test exact:
+with v(x, 0) = 0 the pulse splits into two halves moving at +c and -c.
+
+Usage:
+  python wave_schemes.py            # benchmark: error vs CPU time per scheme
+"""
+
+import time
+from collections import namedtuple
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+
+Scheme = namedtuple("Scheme", ["name", "kernel", "cfl_max", "levels", "description"])
+
+SCHEMES = {}
+
+
+def register_scheme(name, cfl_max, levels=2, description=""):
+    """
+    Decorator that adds an update kernel to SCHEMES.
+
+    kernel(state, lam) -> new state, where state is a tuple of arrays:
+      levels=2: (u, v)
+      levels=3: (u_prev, v_prev, u, v)
+    cfl_max is the largest stable Courant number (0 means never stable).
+    """
+    def wrap(kernel):
+        SCHEMES[name] = Scheme(name, kernel, cfl_max, levels, description)
+        return kernel
+    return wrap
+
+
+def _dplus(w):
+    """w_{j+1} - w_{j-1} on a periodic grid."""
+    return np.roll(w, -1) - np.roll(w, 1)
+
+
+def _laplace(w):
+    """w_{j+1} - 2 w_j + w_{j-1} on a periodic grid."""
+    return np.roll(w, -1) - 2.0 * w + np.roll(w, 1)
+
+
+@register_scheme("ftcs", cfl_max=0.0,
+                 description="forward time, centred space (unstable)")
+def ftcs_step(state, lam):
+    u, v = state
+    return u + 0.5 * lam * _dplus(v), v + 0.5 * lam * _dplus(u)
+
+
+@register_scheme("lax", cfl_max=1.0,
+                 description="Lax-Friedrichs: FTCS with neighbour average")
+def lax_step(state, lam):
+    u, v = state
+    u_avg = 0.5 * (np.roll(u, -1) + np.roll(u, 1))
+    v_avg = 0.5 * (np.roll(v, -1) + np.roll(v, 1))
+    return u_avg + 0.5 * lam * _dplus(v), v_avg + 0.5 * lam * _dplus(u)
+
+
+@register_scheme("lax-wendroff", cfl_max=1.0,
+                 description="second order, Taylor expansion to dt^2")
+def lax_wendroff_step(state, lam):
+    # A = [[0, c], [c, 0]] so A^2 = c^2 I and the dt^2 term is a Laplacian
+    u, v = state
+    u_new = u + 0.5 * lam * _dplus(v) + 0.5 * lam**2 * _laplace(u)
+    v_new = v + 0.5 * lam * _dplus(u) + 0.5 * lam**2 * _laplace(v)
+    return u_new, v_new
+
+
+@register_scheme("leapfrog", cfl_max=1.0, levels=3,
+                 description="three-level centred scheme (as in wavelax)")
+def leapfrog_step(state, lam):
+    u_prev, v_prev, u, v = state
+    return u, v, u_prev + lam * _dplus(v), v_prev + lam * _dplus(u)
+
+
+def gaussian_pulse(x, x0=0.3, sigma=0.02):
+    """Initial displacement used by waveftcs_anim and wavelax."""
+    return np.exp(-0.5 * ((x - x0) / sigma) ** 2)
+
+
+def exact_pulse(x, t, c=1.0, L=1.0, x0=0.3, sigma=0.02):
+    """Exact u(x, t) for the periodic pulse released from rest."""
+    def f(s):
+        # distance to the nearest periodic image of the centre
+        d = (s - x0 + 0.5 * L) % L - 0.5 * L
+        return np.exp(-0.5 * (d / sigma) ** 2)
+    return 0.5 * (f(x - c * t) + f(x + c * t))
+
+
+def stable_dt(name, dx, c=1.0, safety=1.0):
+    """Largest stable dt for a registered scheme: dt = safety * cfl_max * dx / c."""
+    scheme = SCHEMES[name]
+    if scheme.cfl_max <= 0:
+        raise ValueError(f"Scheme '{name}' has no stable time step; pass courant explicitly.")
+    return safety * scheme.cfl_max * dx / c
+
+
+def start_state(name, u0, v0, lam):
+    """Build the initial state tuple; three-level schemes start with one Lax-Wendroff step."""
+    scheme = SCHEMES[name]
+    if scheme.levels == 2:
+        return (u0.copy(), v0.copy())
+    u1, v1 = lax_wendroff_step((u0, v0), lam)
+    return (u0.copy(), v0.copy(), u1, v1)
+
+
+def run_scheme(name, u0, v0, dx, tmax, c=1.0, courant=None, safety=1.0,
+               checkpoint=None):
+    """
+    Integrate from t=0 to t=tmax with a registered scheme.
+
+    If courant is None the largest stable dt is used, rounded down so that
+    an integer number of steps lands exactly on tmax.
+
+    checkpoint: optional checkpoint.CheckpointManager. If it holds a state
+    from the same run, integration resumes from there (bit-for-bit);
+    the state is saved at the manager's cadence.
+
+    Returns:
+      u at tmax, dt, number of steps
+    """
+    scheme = SCHEMES[name]
+    if courant is None:
+        dt_max = stable_dt(name, dx, c, safety)
+    else:
+        dt_max = courant * dx / c
+
+    n_steps = int(np.ceil(tmax / dt_max - 1e-12))
+    dt = tmax / n_steps
+    lam = c * dt / dx
+
+    state = start_state(name, u0, v0, lam)
+    # the starting step of a three-level scheme already covers one dt
+    step = scheme.levels - 2
+
+    if checkpoint is not None:
+        saved = checkpoint.load()
+        if saved is not None:
+            step, _, arrays = saved
+            if (str(arrays["scheme"]) != name or int(arrays["n_steps"]) != n_steps
+                    or float(arrays["lam"]) != lam):
+                raise ValueError(f"Checkpoint {checkpoint.path} belongs to a different run.")
+            state = tuple(arrays[f"s{i}"] for i in range(len(state)))
+
+    while step < n_steps:
+        state = scheme.kernel(state, lam)
+        step += 1
+        if checkpoint is not None:
+            checkpoint.maybe_save(step, step * dt, scheme=np.array(name),
+                                  n_steps=np.int64(n_steps), lam=np.float64(lam),
+                                  **{f"s{i}": w for i, w in enumerate(state)})
+
+    return state[-2], dt, n_steps
+
+
+def benchmark(N_list=(100, 200, 400, 800, 1600), tmax=0.5, c=1.0, L=1.0,
+              safety=0.9, ftcs_courant=0.5, verbose=True):
+    """
+    Run the Gaussian-pulse test for every scheme on a sequence of grids.
+
+    Returns a dict name -> list of (N, dt, steps, L2 error, CPU seconds).
+    safety < 1 keeps away from lambda = 1, where Lax, Lax-Wendroff and
+    leapfrog all reduce to the exact shift and the comparison is trivial.
+    FTCS has no stable dt, so it is run at a fixed Courant number to show
+    how fast it blows up.
+    """
+    results = {}
+    for name, scheme in SCHEMES.items():
+        rows = []
+        for N in N_list:
+            x = np.linspace(0.0, L, N, endpoint=False)
+            dx = L / N
+            u0 = gaussian_pulse(x)
+            v0 = np.zeros_like(u0)
+            courant = ftcs_courant if scheme.cfl_max <= 0 else None
+
+            t0 = time.process_time()
+            with np.errstate(over="ignore", invalid="ignore"):
+                u, dt, n_steps = run_scheme(name, u0, v0, dx, tmax, c, courant, safety)
+            cpu = time.process_time() - t0
+
+            err = np.sqrt(dx * np.sum((u - exact_pulse(x, tmax, c, L)) ** 2))
+            rows.append((N, dt, n_steps, err, cpu))
+        results[name] = rows
+
+    if verbose:
+        print(f"{'scheme':<14}{'N':>7}{'dt':>12}{'steps':>8}{'L2 error':>12}"
+              f"{'CPU s':>10}{'err*CPU':>12}")
+        for name, rows in results.items():
+            for N, dt, n_steps, err, cpu in rows:
+                print(f"{name:<14}{N:>7}{dt:>12.3e}{n_steps:>8}{err:>12.3e}"
+                      f"{cpu:>10.4f}{err * cpu:>12.3e}")
+    return results
+
+
+def main():
+    results = benchmark()
+
+    # Work-precision diagram: lower-left is better
+    plt.figure()
+    for name, rows in results.items():
+        err = np.array([r[3] for r in rows])
+        cpu = np.array([r[4] for r in rows])
+        ok = np.isfinite(err)
+        if ok.any():
+            plt.loglog(cpu[ok], err[ok], "o-", label=name)
+    plt.xlabel("CPU time (s)")
+    plt.ylabel("L2 error at t_max")
+    plt.title("Wave equation: error vs CPU time (Gaussian pulse)")
+    plt.legend()
+    plt.grid(True, which="both", alpha=0.3)
+    plt.savefig("wave_schemes_benchmark.png")
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()